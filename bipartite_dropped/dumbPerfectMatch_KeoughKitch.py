@@ -1,8 +1,11 @@
 import csv
 import ast
 import time
+import multiprocessing
 from collections import defaultdict
 
+from graphFile_KeoughKitch import iter_graphs
+
 def process_graph(graph):
     """Converts set of edge tuples into a dictionary for bipartite matching."""
     g_dict = defaultdict(list)
@@ -11,70 +14,152 @@ def process_graph(graph):
         g_dict[left].append(right)
     return g_dict
 
+def bipartite_csr(graph, part_A, part_B):
+    """Builds CSR adjacency (starts, adj) from part_A to part_B, using edges in either direction."""
+    index_A = {u: i for i, u in enumerate(part_A)}
+    index_B = {v: i for i, v in enumerate(part_B)}
+    counts = [0] * (len(part_A) + 1)
+    pairs = []
+    for u, targets in graph.items():
+        for v in targets:
+            if u in index_A and v in index_B:
+                a, b = index_A[u], index_B[v]
+            elif u in index_B and v in index_A:
+                a, b = index_A[v], index_B[u]
+            else:
+                continue
+            pairs.append((a, b))
+            counts[a + 1] += 1
+    for i in range(len(part_A)):
+        counts[i + 1] += counts[i]
+    starts = counts[:]
+    adj = [0] * len(pairs)
+    for a, b in pairs:
+        adj[counts[a]] = b
+        counts[a] += 1
+    return starts, adj
+
+def hopcroft_karp(starts, adj, num_left, num_right, match_l=None):
+    """Returns the size of a maximum matching, in O(E * sqrt(V)) with no recursion.
+
+    If match_l is given (a list of num_left -1s) it is filled in with each left vertex's partner.
+    """
+    INF = num_left + 1
+    if match_l is None:
+        match_l = [-1] * num_left
+    match_r = [-1] * num_right
+    dist = [0] * num_left
+    size = 0
+
+    # Greedy initial matching
+    for u in range(num_left):
+        for e in range(starts[u], starts[u + 1]):
+            v = adj[e]
+            if match_r[v] == -1:
+                match_l[u] = v
+                match_r[v] = u
+                size += 1
+                break
+
+    while True:
+        # BFS layers the left vertices by alternating path length from a free one
+        queue = [u for u in range(num_left) if match_l[u] == -1]
+        for u in range(num_left):
+            dist[u] = 0 if match_l[u] == -1 else INF
+        found = False
+        for u in queue:  # queue grows while it is walked
+            for e in range(starts[u], starts[u + 1]):
+                w = match_r[adj[e]]
+                if w == -1:
+                    found = True
+                elif dist[w] == INF:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        if not found:
+            return size
+
+        # DFS along the layers for vertex-disjoint shortest augmenting paths
+        next_edge = starts[:-1]
+        for root in range(num_left):
+            if match_l[root] != -1:
+                continue
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                if next_edge[u] == starts[u + 1]:
+                    dist[u] = INF  # dead end for the rest of this phase
+                    stack.pop()
+                    continue
+                v = adj[next_edge[u]]
+                next_edge[u] += 1
+                w = match_r[v]
+                if w == -1:
+                    # Flip the path: each vertex on the stack takes the edge it last followed
+                    for x in stack:
+                        y = adj[next_edge[x] - 1]
+                        match_l[x] = y
+                        match_r[y] = x
+                    size += 1
+                    break
+                if dist[w] == dist[u] + 1:
+                    stack.append(w)
+
 def bipartite_match(graph, part_A, part_B):
-    """Uses Kuhn's algorithm for bipartite matching."""
-    left = list(graph.keys())
-    right = list(set(v for targets in graph.values() for v in targets))  # Unique right vertices
-
-    # Ensure that the graph includes all vertices from part_A and part_B
-    if len(left) < len(part_A) or len(right) < len(part_B):
-        return False  # If some vertices are missing, it's not a perfect match
-
-    num_left = len(left)
-    num_right = len(right)
-
-    # Map right vertices to their indices for faster lookup
-    right_index_map = {v: i for i, v in enumerate(right)}
-
-    mt = [-1] * num_right  # Match result: right-hand side vertex to left-hand side vertex
-    used = [False] * num_left
-
-    def try_kuhn(v):
-        """Kuhn's algorithm to find augmenting paths."""
-        if used[v]:
-            return False
-        used[v] = True
-
-        for r in graph[left[v]]:
-            right_idx = right_index_map[r]  # Use the index from the map
-            if mt[right_idx] == -1 or try_kuhn(mt[right_idx]):
-                mt[right_idx] = v
-                return True
-        return False
-
-    # Try to match each left vertex
-    for v in range(num_left):
-        used = [False] * num_left
-        if not try_kuhn(v):
-            return False  # Return False if the matching fails for any left vertex
-
-    # Check that all left vertices are matched (ensuring a perfect match)
-    return all(m != -1 for m in mt[:len(part_B)])  # Only check the portion that corresponds to part_B
-
-def is_perfect_k_partite_graph(sets, edges):
-    """Check if the k-partite graph has a perfect matching using Kuhn's algorithm between every pair of partitions."""
+    """Uses the Hopcroft-Karp algorithm to check for a perfect matching between part_A and part_B."""
+    if len(part_A) != len(part_B):
+        return False  # A perfect matching needs both sides the same size
+    starts, adj = bipartite_csr(graph, part_A, part_B)
+    return hopcroft_karp(starts, adj, len(part_A), len(part_B)) == len(part_A)
+
+def partition_pairs(sets, edges):
+    """Buckets edges by unordered partition pair (i, j) with i < j, in one pass over the edges."""
+    part_of = {v: i for i, part in enumerate(sets) for v in part}
+    buckets = defaultdict(list)
+    for u, v in edges:
+        i, j = part_of.get(u), part_of.get(v)
+        if i is None or j is None or i == j:
+            continue  # not an edge between two partitions
+        buckets[(i, j) if i < j else (j, i)].append((u, v))
+    return buckets
+
+def check_pair(task):
+    """Checks one partition pair; task is (part_A, part_B, edges between them)."""
+    part_A, part_B, pair_edges = task
+    return bipartite_match(process_graph(pair_edges), part_A, part_B)
+
+def is_perfect_k_partite_graph(sets, edges, workers=None):
+    """Check if the k-partite graph has a perfect matching between every pair of partitions.
+
+    Matching is symmetric, so each unordered pair is checked once.  The first pair
+    without a perfect matching ends the check.  With workers set, the pairs are
+    checked on a multiprocessing pool of that size.
+    """
     k = len(sets)  # Number of partitions
-
-    # We need to run bipartite matching between every pair of partitions
-    for part_i in range(k):
-        part_A = sets[part_i]
-        for part_j in range(k):
-            if part_i == part_j:
-                continue  # Skip matching a partition with itself
-            
-            part_B = sets[part_j]
-
-            # Create a subgraph with edges only between part_A and part_B
-            subgraph = {(u, v) for u, v in edges if (u in part_A and v in part_B) or (u in part_B and v in part_A)}
-
-            # Process the subgraph into a dictionary
-            graph = process_graph(subgraph)
-
-            # Use Kuhn's algorithm to check if there is a perfect matching
-            if not bipartite_match(graph, part_A, part_B):
-                return k, len(part_A), False  # Not a perfect matching
-
-    return k, len(sets[0]), True  # All partitions have a perfect matching
+    n = len(sets[0]) if sets else 0
+    buckets = partition_pairs(sets, edges)
+    tasks = ((sets[i], sets[j], buckets.get((i, j), [])) for i in range(k) for j in range(i + 1, k))
+
+    if workers:
+        with multiprocessing.Pool(workers) as pool:
+            for perfect in pool.imap_unordered(check_pair, tasks):
+                if not perfect:
+                    return k, n, False  # leaving the pool cancels the other pairs
+        return k, n, True
+
+    for task in tasks:
+        if not check_pair(task):
+            return k, n, False  # Not a perfect matching
+    return k, n, True  # All partitions have a perfect matching
+
+def report_graph(idx, sets, edges):
+    """Checks one graph and prints its status and execution time."""
+    start_time = time.time()  # Start the timer
+    k, n, perfect = is_perfect_k_partite_graph(sets, edges)
+    result = "Perfect" if perfect else "Not Perfect"
+    end_time = time.time()  # End the timer
+
+    execution_time = end_time - start_time  # Calculate execution time
+    print(f"Graph {idx + 1}: k = {k}, n = {n}, Status: {result} (Execution Time: {execution_time:.6f} seconds)")
 
 def process_graph_from_csv(filename):
     """Read and process each k-partite graph from a CSV file, one graph at a time."""
@@ -86,15 +171,12 @@ def process_graph_from_csv(filename):
             # Assume the first column is the partition sets and the second is the edges
             sets = ast.literal_eval(row[0])
             edges = set(ast.literal_eval(row[1]))  # Convert edges to set
+            report_graph(idx, sets, edges)
 
-            # Process the graph
-            start_time = time.time()  # Start the timer
-            k, n, perfect = is_perfect_k_partite_graph(sets, edges)
-            result = "Perfect" if perfect else "Not Perfect"
-            end_time = time.time()  # End the timer
-
-            execution_time = end_time - start_time  # Calculate execution time
-            print(f"Graph {idx + 1}: k = {k}, n = {n}, Status: {result} (Execution Time: {execution_time:.6f} seconds)")
+def process_graph_from_binary(filename):
+    """Read and process each k-partite graph from a binary .kpg file, one graph at a time."""
+    for idx, (sets, edges) in enumerate(iter_graphs(filename)):
+        report_graph(idx, [part.tolist() for part in sets], set(map(tuple, edges.tolist())))
 
 def dumbPerfectMatch_KeoughKitch():
     filename1 = "not_perfect_k_partite_graph.csv"  # Change to your CSV filename
@@ -104,5 +186,10 @@ def dumbPerfectMatch_KeoughKitch():
     process_graph_from_csv(filename1)
     process_graph_from_csv(filename2)
 
+    # Or from the binary files (generateTests_KeoughKitch.py --binary, or converted
+    #   with graphFile_KeoughKitch.py)
+    # process_graph_from_binary("not_perfect_k_partite_graph.kpg")
+    # process_graph_from_binary("perfect_k_partite_graph.kpg")
+
 if __name__ == "__main__":
     dumbPerfectMatch_KeoughKitch()
@@ -0,0 +1,170 @@
+"""Bipartite matching kept up to date as edges are inserted and deleted.
+
+DynamicMatcher holds a maximum matching between part_A and part_B.  The first
+matching comes from Hopcroft-Karp; after that each update is repaired with at most
+one augmenting path instead of recomputing the matching from empty.  When the
+matching was maximum before the update, a deletion can only make room for a path
+ending at one of the two vertices it freed, and an insertion only for one through
+the new edge, so the search starts from those vertices.  It also grows a tree back
+from the free vertices, but only once that tree would be the smaller of the two,
+so an update costs about the size of the smaller search, never a pass over every
+free vertex.
+"""
+from collections import defaultdict
+
+from dumbPerfectMatch_KeoughKitch import process_graph, bipartite_csr, hopcroft_karp
+
+
+class DynamicMatcher:
+    def __init__(self, part_A, part_B, edges=()):
+        self.side = {v: 0 for v in part_A}
+        self.side.update((v, 1) for v in part_B)
+        if len(self.side) != len(part_A) + len(part_B):
+            raise ValueError("part_A and part_B must be disjoint")
+        self.size = len(self.side)
+        self.balanced = len(part_A) == len(part_B)
+        self.adj = defaultdict(set)
+        self.match = {}  # vertex -> partner, for matched vertices only
+        self.free = (set(), set())  # unmatched vertices of each side that have an edge
+
+        for u, v in edges:
+            self._add(u, v)
+        starts, adj = bipartite_csr(process_graph(edges), part_A, part_B)
+        match_l = [-1] * len(part_A)
+        hopcroft_karp(starts, adj, len(part_A), len(part_B), match_l)
+        for a, b in enumerate(match_l):
+            if b != -1:
+                self._pair(part_A[a], part_B[b])
+
+    def _add(self, u, v):
+        if u not in self.side or v not in self.side:
+            raise ValueError(f"edge ({u}, {v}) has a vertex outside both parts")
+        if self.side[u] == self.side[v]:
+            raise ValueError(f"edge ({u}, {v}) does not cross between the parts")
+        self.adj[u].add(v)
+        self.adj[v].add(u)
+        for w in (u, v):
+            if w not in self.match:
+                self.free[self.side[w]].add(w)
+
+    def _pair(self, u, v):
+        self.match[u] = v
+        self.match[v] = u
+        self.free[self.side[u]].discard(u)
+        self.free[self.side[v]].discard(v)
+
+    def _reach_free(self, sources):
+        """Shortest alternating path [x0, x1, ..., xk] from one of sources to a free vertex xk
+        on the same side, where each x(i+1) is a neighbour of x(i)'s partner; None if there is none.
+
+        back is the tree grown from sources.  Once it has more vertices waiting than
+        there are free vertices on that side, a second tree fwd is grown from those
+        free vertices the other way, and from then on the smaller of the two is extended.
+        Either tree running out means there is no path.
+        """
+        match, adj = self.match, self.adj
+        back = {}
+        for x in sources:
+            if x not in match:
+                return [x]
+            back[x] = None
+        fwd = None
+        queue = [list(back), None]
+        head = [0, 0]
+        while True:
+            if fwd is None and len(queue[0]) - head[0] > len(self.free[self.side[queue[0][0]]]):
+                fwd = {w: None for w in self.free[self.side[queue[0][0]]]}
+                queue[1] = list(fwd)
+            left = [len(queue[0]) - head[0], None if fwd is None else len(queue[1]) - head[1]]
+            if left[0] == 0 or left[1] == 0:
+                return None
+            if fwd is None or left[0] <= left[1]:
+                x = queue[0][head[0]]
+                head[0] += 1
+                for z in adj[match[x]]:
+                    if z in back:
+                        continue
+                    back[z] = x
+                    if z not in match or (fwd is not None and z in fwd):
+                        return self._join(z, back, fwd)
+                    queue[0].append(z)
+            else:
+                a = queue[1][head[1]]
+                head[1] += 1
+                for y in adj[a]:
+                    z = match.get(y)
+                    if z is None or z in fwd:
+                        continue  # a free y would be an augmenting path the matching already ruled out
+                    fwd[z] = a
+                    if z in back:
+                        return self._join(z, back, fwd)
+                    queue[1].append(z)
+
+    @staticmethod
+    def _join(z, back, fwd):
+        path = [z]
+        while back[path[-1]] is not None:
+            path.append(back[path[-1]])
+        path.reverse()
+        w = None if fwd is None else fwd.get(z)
+        while w is not None:
+            path.append(w)
+            w = fwd[w]
+        return path
+
+    def _shift(self, path):
+        # Moves each partner one step down the path; path[0] is left for the caller to pair
+        old = [self.match[x] for x in path[:-1]]
+        for i in range(1, len(path)):
+            self._pair(path[i], old[i - 1])
+
+    def insert_edge(self, u, v):
+        if v in self.adj[u]:
+            return
+        self._add(u, v)
+        # A new augmenting path must use (u, v): it joins a path from u to a free vertex
+        # on u's side with one from v to a free vertex on v's side
+        if not self.free[0] or not self.free[1]:
+            return
+        half_u = self._reach_free([u])
+        if half_u is None:
+            return
+        half_v = self._reach_free([v])
+        if half_v is None:
+            return
+        self._shift(half_u)
+        self._shift(half_v)
+        self._pair(u, v)
+
+    def delete_edge(self, u, v):
+        if v not in self.adj[u]:
+            return
+        self.adj[u].discard(v)
+        self.adj[v].discard(u)
+        matched = self.match.get(u) == v
+        if matched:
+            del self.match[u]
+            del self.match[v]
+        for w in (u, v):
+            if w not in self.match:
+                if self.adj[w]:
+                    self.free[self.side[w]].add(w)
+                else:
+                    self.free[self.side[w]].discard(w)
+        if matched:
+            # A new augmenting path must end at u or v, and one is enough to restore
+            # the size: u's neighbour y0, y0's partner's neighbour y1, ... up to a free vertex
+            for w in (u, v):
+                if self.adj[w]:
+                    path = self._reach_free(list(self.adj[w]))
+                    if path is not None:
+                        self._shift(path)
+                        self._pair(w, path[0])
+                        break
+
+    def is_perfect(self):
+        return self.balanced and len(self.match) == self.size
+
+    def matching(self):
+        """The current matching as a list of (part_A vertex, part_B vertex) pairs."""
+        return [(u, v) for u, v in self.match.items() if self.side[u] == 0]
@@ -1,6 +1,80 @@
 import csv
+import sys
 import random
 
+import numpy as np
+
+from graphFile_KeoughKitch import write_graph, write_graph_stream
+
+def k_partite_edge_chunks(k, n, rng=None, avg_degree=None, distribution='uniform', exponent=2.5,
+                          isolate=None, chunk_edges=1 << 20):
+    """
+    Generate the edges of a k-partite graph between adjacent partitions, as (m, 2) int32 arrays.
+
+    Partition i holds the vertices i*n .. (i+1)*n - 1.  With avg_degree None each pair of
+    adjacent partitions is complete.  Otherwise every layer gets a planted random perfect
+    matching plus random edges with about avg_degree per source vertex, drawn per vertex
+    from a binomial ('uniform') or Pareto ('powerlaw', needs exponent > 2) distribution.
+    Either way every adjacent pair has a perfect matching.  Edges touching the vertex
+    isolate are left out.  Edges are unique, and at most about chunk_edges are in memory.
+
+    Parameters:
+    k (int): Number of partitions
+    n (int): Number of nodes per partition
+    rng (numpy.random.Generator): Random source, needed when avg_degree is set
+    avg_degree (float): Average number of random edges per vertex in each layer
+    distribution (str): 'uniform' or 'powerlaw' degree distribution
+    exponent (float): Power-law exponent of the 'powerlaw' distribution
+    isolate (int): A vertex to leave without edges, or None
+    chunk_edges (int): Rough number of edges per yielded chunk
+
+    Yields:
+    numpy.ndarray: (m, 2) arrays of (u, v) edges with u in partition i and v in partition i + 1
+    """
+    targets = np.arange(n, dtype=np.int64)
+    per_row = n if avg_degree is None else max(1.0, avg_degree)
+    rows_per_chunk = max(1, int(chunk_edges // per_row))
+    for i in range(k - 1):
+        if avg_degree is not None:
+            planted = rng.permutation(n)
+        for r0 in range(0, n, rows_per_chunk):
+            rows = np.arange(r0, min(n, r0 + rows_per_chunk), dtype=np.int64)
+            if avg_degree is None:
+                src = np.repeat(rows, n)
+                dst = np.tile(targets, len(rows))
+            else:
+                if distribution == 'uniform':
+                    degree = rng.binomial(n, min(1.0, avg_degree / n), size=len(rows))
+                elif distribution == 'powerlaw':
+                    shape = exponent - 1
+                    degree = (rng.pareto(shape, size=len(rows)) + 1) * avg_degree * (shape - 1) / shape
+                    degree = np.minimum(n, degree.astype(np.int64))
+                else:
+                    raise ValueError(f"unknown degree distribution {distribution!r}")
+                src = np.concatenate([rows, np.repeat(rows, degree)])
+                dst = np.concatenate([planted[rows], rng.integers(0, n, size=int(degree.sum()))])
+                codes = np.unique(src * n + dst)  # also drops duplicate edges
+                src, dst = codes // n, codes % n
+            edges = np.stack([src + i * n, dst + (i + 1) * n], axis=1).astype(np.int32)
+            if isolate is not None:
+                edges = edges[(edges[:, 0] != isolate) & (edges[:, 1] != isolate)]
+            yield edges
+
+def stream_k_partite_graph(filename, k, n, seed=None, perfect=True, append=False, **options):
+    """
+    Write one (possibly very large) k-partite graph to a binary .kpg file in bounded memory.
+
+    The not perfect version leaves a random vertex of the last partition without edges, so
+    the last two partitions have no perfect matching.  options go to k_partite_edge_chunks.
+    Returns the number of edges written.
+    """
+    rng = np.random.default_rng(seed)
+    isolate = None if perfect else (k - 1) * n + int(rng.integers(n))
+    sets = [np.arange(i * n, (i + 1) * n, dtype=np.int32) for i in range(k)]
+    with open(filename, 'r+b' if append else 'wb') as file:
+        file.seek(0, 2)
+        return write_graph_stream(file, sets, k_partite_edge_chunks(k, n, rng, isolate=isolate, **options))
+
 def create_complex_perfect_k_partite_graph(k, n, additional_edges=0):
     """
     Create a complex perfect k-partite graph where nodes can connect to multiple adjacent partitions.
@@ -14,15 +88,12 @@ def create_complex_perfect_k_partite_graph(k, n, additional_edges=0):
     tuple: (sets, edges)
     """
     # Create k sets of n nodes each
-    sets = [list(range(sum([n] * i), sum([n] * (i + 1)))) for i in range(k)]
+    sets = [list(range(i * n, (i + 1) * n)) for i in range(k)]
     
+    # Connect each node in a partition to each node in the next partition
     edges = set()
-    # Connect each partition to the next in a perfect manner
-    for i in range(k - 1):
-        # Each node in the current partition connects to each node in the next partition
-        for node in sets[i]:
-            for target_node in sets[i + 1]:
-                edges.add((node, target_node))
+    for chunk in k_partite_edge_chunks(k, n):
+        edges.update(map(tuple, chunk.tolist()))
     
     # Add additional random edges between adjacent partitions
     for _ in range(additional_edges):
@@ -37,7 +108,7 @@ def create_complex_perfect_k_partite_graph(k, n, additional_edges=0):
 
 def create_complex_not_perfect_k_partite_graph(k, n):
     """
-    Create an imperfect k-partite graph by removing several edges to ensure it's not perfect.
+    Create an imperfect k-partite graph by leaving one vertex in the last partition without edges.
     
     Parameters:
     k (int): Number of partitions
@@ -46,16 +117,14 @@ def create_complex_not_perfect_k_partite_graph(k, n):
     Returns:
     tuple: (sets, edges)
     """
-    sets, edges = create_complex_perfect_k_partite_graph(k, n)
+    sets = [list(range(i * n, (i + 1) * n)) for i in range(k)]
 
-    # Ensure that at least one edge is removed to make it imperfect
-    # To guarantee non-perfection, we can remove connections to ensure at least one vertex
-    # in the last partition is unmatched.
-    
-    # Randomly remove edges from the last partition
-    if sets[-1]:  # Check if there are nodes in the last partition
-        unmatched_node = random.choice(sets[-1])
-        edges = {(u, v) for u, v in edges if v != unmatched_node}  # Remove all edges to this node
+    # To guarantee non-perfection, one vertex in the last partition gets no edges,
+    # so it cannot be matched.
+    edges = set()
+    unmatched_node = random.choice(sets[-1]) if n else None
+    for chunk in k_partite_edge_chunks(k, n, isolate=unmatched_node):
+        edges.update(map(tuple, chunk.tolist()))
 
     return sets, edges
 
@@ -71,6 +140,14 @@ def write_graphs_to_csv(sets_perfect, edges_perfect, sets_not_perfect, edges_not
         writer = csv.writer(file)
         writer.writerow([sets_not_perfect, list(edges_not_perfect)])
 
+def write_graphs_to_binary(sets_perfect, edges_perfect, sets_not_perfect, edges_not_perfect):
+    """Write the perfect and non-perfect graphs to the binary files read by graphFile_KeoughKitch."""
+    with open('perfect_k_partite_graph.kpg', mode='ab') as file:
+        write_graph(file, sets_perfect, edges_perfect)
+
+    with open('not_perfect_k_partite_graph.kpg', mode='ab') as file:
+        write_graph(file, sets_not_perfect, edges_not_perfect)
+
 def clear_file(filename):
     """Clear the contents of the specified file."""
     with open(filename, 'w') as file:
@@ -85,6 +162,10 @@ if __name__ == "__main__":
     # Clear files
     clear_file("not_perfect_k_partite_graph.csv")
     clear_file("perfect_k_partite_graph.csv")
+    binary = "--binary" in sys.argv  # also write the .kpg binary files
+    if binary:
+        clear_file("not_perfect_k_partite_graph.kpg")
+        clear_file("perfect_k_partite_graph.kpg")
 
     for k in range(mink, maxk):
         for n in range(minn, maxn):
@@ -97,5 +178,12 @@ if __name__ == "__main__":
             
             # Write to CSV
             write_graphs_to_csv(sets_perfect, edges_perfect, sets_not_perfect, edges_not_perfect)
+            if binary:
+                write_graphs_to_binary(sets_perfect, edges_perfect, sets_not_perfect, edges_not_perfect)
 
     print('Complex Perfect and Non-Perfect graphs have been written to CSV files.')
+
+    # Very large graphs go straight to the binary format, for example 3 partitions of
+    # 1,000,000 vertices with about 4 random edges per vertex per layer:
+    # stream_k_partite_graph('big_perfect.kpg', 3, 10**6, seed=1, avg_degree=4)
+    # stream_k_partite_graph('big_not_perfect.kpg', 3, 10**6, seed=1, perfect=False, avg_degree=4)
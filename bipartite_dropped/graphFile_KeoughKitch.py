@@ -0,0 +1,106 @@
+"""Binary container for k-partite graphs.
+
+A file holds any number of graph records back to back.  Each record is, little-endian:
+
+    header    magic b'KPG1', k (uint32), vertex count V (uint64), edge count E (uint64)
+    offsets   int64[k + 1]   partition i is vertices[offsets[i]:offsets[i + 1]]
+    vertices  int32[V]
+    edges     int32[2 * E]   pairs (u, v)
+    padding   to a multiple of 8 bytes, so every record starts aligned
+
+Records are read straight out of a numpy.memmap of the file, so loading a graph
+copies nothing until the caller converts it.
+"""
+import csv
+import ast
+import sys
+import struct
+
+import numpy as np
+
+MAGIC = b'KPG1'
+HEADER = struct.Struct('<4sIQQ')
+
+
+def write_graph(file, sets, edges):
+    """Appends one graph record to an open binary file."""
+    offsets = np.zeros(len(sets) + 1, dtype='<i8')
+    offsets[1:] = np.cumsum([len(part) for part in sets])
+    vertices = np.fromiter((v for part in sets for v in part), dtype='<i4', count=int(offsets[-1]))
+    edge_array = np.array(list(edges), dtype='<i4').reshape(-1, 2)
+    file.write(HEADER.pack(MAGIC, len(sets), len(vertices), len(edge_array)))
+    file.write(offsets.tobytes())
+    file.write(vertices.tobytes())
+    file.write(edge_array.tobytes())
+    size = HEADER.size + offsets.nbytes + vertices.nbytes + edge_array.nbytes
+    file.write(b'\0' * (-size % 8))
+
+
+def write_graph_stream(file, sets, edge_chunks):
+    """Appends one graph record whose edges arrive as an iterable of (m, 2) integer arrays; returns the edge count.
+
+    Only one chunk is held at a time.  The edge count is patched into the header at the
+    end, so file must be seekable and not opened in append mode ('wb' or 'r+b').
+    """
+    offsets = np.zeros(len(sets) + 1, dtype='<i8')
+    offsets[1:] = np.cumsum([len(part) for part in sets])
+    start = file.tell()
+    file.write(HEADER.pack(MAGIC, len(sets), int(offsets[-1]), 0))
+    file.write(offsets.tobytes())
+    for part in sets:
+        file.write(np.asarray(part, dtype='<i4').tobytes())
+    num_edges = 0
+    for chunk in edge_chunks:
+        chunk = np.ascontiguousarray(chunk, dtype='<i4').reshape(-1, 2)
+        file.write(chunk.tobytes())
+        num_edges += len(chunk)
+    end = file.tell()
+    file.write(b'\0' * (-(end - start) % 8))
+    end = file.tell()
+    file.seek(start)
+    file.write(HEADER.pack(MAGIC, len(sets), int(offsets[-1]), num_edges))
+    file.seek(end)
+    return num_edges
+
+
+def iter_graphs(filename):
+    """Yields (sets, edges) for each record: sets is a list of int32 arrays, edges an (E, 2) int32 array.
+
+    Both are views into the memory-mapped file, so only one graph at a time is ever paged in.
+    """
+    data = np.memmap(filename, dtype=np.uint8, mode='r') if _size(filename) else np.zeros(0, np.uint8)
+    pos = 0
+    while pos < len(data):
+        magic, k, num_vertices, num_edges = HEADER.unpack_from(data, pos)
+        if magic != MAGIC:
+            raise ValueError(f"{filename}: bad graph record at byte {pos}")
+        pos += HEADER.size
+        offsets = np.frombuffer(data, dtype='<i8', count=k + 1, offset=pos)
+        pos += offsets.nbytes
+        vertices = np.frombuffer(data, dtype='<i4', count=num_vertices, offset=pos)
+        pos += vertices.nbytes
+        edges = np.frombuffer(data, dtype='<i4', count=2 * num_edges, offset=pos).reshape(-1, 2)
+        pos += edges.nbytes
+        pos += -pos % 8
+        yield [vertices[offsets[i]:offsets[i + 1]] for i in range(k)], edges
+
+
+def _size(filename):
+    with open(filename, 'rb') as file:
+        return file.seek(0, 2)
+
+
+def csv_to_binary(csv_filename, binary_filename):
+    """Converts a CSV file of (sets, edges) rows into the binary format; returns the graph count."""
+    csv.field_size_limit(10**9)
+    count = 0
+    with open(csv_filename, newline='') as src, open(binary_filename, 'wb') as dst:
+        for row in csv.reader(src):
+            write_graph(dst, ast.literal_eval(row[0]), ast.literal_eval(row[1]))
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    # python3 graphFile_KeoughKitch.py graphs.csv graphs.kpg
+    print(f"Converted {csv_to_binary(sys.argv[1], sys.argv[2])} graphs")
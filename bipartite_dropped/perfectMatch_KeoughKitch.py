@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+import heapq
+
 
 
 #A function that will create the graph will take in: k (int) and sets (list) and will return the graph
@@ -17,67 +19,173 @@ def add_edge(graph,edges):
         graph[v].append(u)
 
 #This function helps simply the graph, takes in graph as an argument, outputs a simplified graph
-#It implemnets the unit rule of eliminating verticies with only one possible match (unit rule)
+#It implemnets the unit rule: a vertex with only one neighbour must be matched to it, so both are
+#removed (along with the neighbour's other edges).  Vertices that start with no neighbours are dropped.
+#A worklist holds the vertices whose degree has fallen to 0 or 1, so every vertex and edge is
+#handled a constant number of times.  A vertex left with no neighbours by a forced match stays in
+#the graph, with an empty list, so the matching below reports that it cannot be matched.
 def fixGraph(newGraph):
-    change = True
-    while change:
-        change = False
-        removeFrom = []
-        for v in list(newGraph.keys()):
-            if len(newGraph[v]) == 0:
-                removeFrom.append(v)
-                change = True
-            elif len(newGraph[v]) == 1:
-                u = newGraph[v][0]
-                if len(newGraph[u]) > 1:
-                    continue
-                removeFrom.append(v)
-                removeFrom.append(u)
-                change = True
-        for v in removeFrom:
-            if v in newGraph:
-                for n in newGraph[v]:
-                    if n in newGraph:
-                        newGraph[n].remove(v)
-                del newGraph[v]
+    adj = {v: set(n) for v, n in newGraph.items()}
+    removed = set()
+    for v in [v for v in adj if not adj[v]]:
+        removed.add(v)
+    work = [v for v in adj if len(adj[v]) == 1]
+    while work:
+        v = work.pop()
+        if v in removed or len(adj[v]) != 1:
+            continue
+        u = adj[v].pop()
+        adj[u].discard(v)
+        removed.add(v)
+        removed.add(u)
+        for n in adj[u]:
+            adj[n].discard(u)
+            if len(adj[n]) == 1:
+                work.append(n)
+        adj[u] = set()
+    for v in removed:
+        del newGraph[v]
+    for v in newGraph:
+        newGraph[v] = [n for n in newGraph[v] if n not in removed]
     return newGraph
 
-#Function that uses Depth First Search (DFS) to find perfect macthes 
-def matchableGraph(v, newGraph, match, visit):
-    for n in newGraph[v]:
-        if visit[n]:
+#Greedy start for the matching (Karp-Sipser style): always match a free vertex with the fewest
+#free neighbours left, to its free neighbour with the fewest.  Degree-1 vertices go first, so
+#their only partner is not taken by someone else, and far fewer augmenting paths are left for
+#Edmonds to find.  The heap holds (degree, vertex) entries; stale ones are skipped.
+def greedyMatch(adj, match):
+    degree = [len(a) for a in adj]
+    heap = [(degree[v], v) for v in range(len(adj))]
+    heapq.heapify(heap)
+    while heap:
+        d, v = heapq.heappop(heap)
+        if match[v] != -1 or d != degree[v]:
+            continue
+        best = -1
+        for u in adj[v]:
+            if match[u] == -1 and (best == -1 or degree[u] < degree[best]):
+                best = u
+        if best == -1:
+            continue
+        match[v] = best
+        match[best] = v
+        for w in adj[v] + adj[best]:
+            if match[w] == -1:
+                degree[w] -= 1
+                heapq.heappush(heap, (degree[w], w))
+
+#Edmonds' blossom algorithm: a BFS from a free root over alternating paths.  An edge that closes
+#an odd cycle (a blossom) contracts it by giving all its vertices the same base, so the search
+#goes on through it.  Returns the free vertex an augmenting path reaches, or -1.
+#parent/base/used are shared between searches; only the vertices in tree are reset afterwards.
+#members[b] lists the vertices whose base is b, for bases that have absorbed a blossom.
+def findAugmentingPath(root, adj, match, parent, base, used, tree):
+    for v in tree:
+        parent[v] = -1
+        base[v] = v
+        used[v] = False
+    del tree[:]
+    members = {}
+    used[root] = True
+    tree.append(root)
+    queue = [root]
+    for v in queue:  # queue grows while it is walked
+        for to in adj[v]:
+            if base[v] == base[to] or match[v] == to:
+                continue
+            if to == root or (match[to] != -1 and parent[match[to]] != -1):
+                # to is an even vertex too, so (v, to) closes a blossom
+                curbase = commonBase(v, to, match, parent, base)
+                blossom = set()
+                markPath(v, curbase, to, match, parent, base, blossom)
+                markPath(to, curbase, v, match, parent, base, blossom)
+                merged = members.setdefault(curbase, [curbase])
+                for b in blossom:
+                    if b == curbase:
+                        continue
+                    for i in members.pop(b, [b]):
+                        base[i] = curbase
+                        merged.append(i)
+                        if not used[i]:
+                            used[i] = True
+                            queue.append(i)
+            elif parent[to] == -1:
+                parent[to] = v
+                tree.append(to)
+                if match[to] == -1:
+                    return to
+                used[match[to]] = True
+                tree.append(match[to])
+                queue.append(match[to])
+    return -1
+
+#Lowest common ancestor of a and b in the alternating tree, by blossom base
+def commonBase(a, b, match, parent, base):
+    seen = set()
+    while True:
+        a = base[a]
+        seen.add(a)
+        if match[a] == -1:
+            break
+        a = parent[match[a]]
+    while True:
+        b = base[b]
+        if b in seen:
+            return b
+        b = parent[match[b]]
+
+#Walks from v up to the blossom base b, marking the blossom and pointing odd vertices back along it
+def markPath(v, b, child, match, parent, base, blossom):
+    while base[v] != b:
+        blossom.add(base[v])
+        blossom.add(base[match[v]])
+        parent[v] = child
+        child = match[v]
+        v = parent[match[v]]
+
+#Maximum matching of a general graph given as adjacency lists of vertex indices.  With
+#stopEarly the search gives up at the first vertex that cannot be matched (it never can be
+#later either), which is all a perfect matching check needs.  Returns the match list.
+def maxMatching(adj, stopEarly=False):
+    n = len(adj)
+    match = [-1] * n
+    greedyMatch(adj, match)
+    parent = [-1] * n
+    base = list(range(n))
+    used = [False] * n
+    tree = []
+    for root in range(n):
+        if match[root] != -1:
+            continue
+        v = findAugmentingPath(root, adj, match, parent, base, used, tree)
+        if v == -1:
+            if stopEarly:
+                break
             continue
-        visit[n] = True
-        if n not in match or matchableGraph(match[n], newGraph, match, visit):
-            match[n] = v
-            return True
-    return False
+        while v != -1:  # flip the path back to the root
+            pv = parent[v]
+            ppv = match[pv]
+            match[v] = pv
+            match[pv] = v
+            v = ppv
+    return match
 
 
 
 #This function is the matching algorithm, takes in the graph and returns bool, calls the function that performs rules
+#The graph joins all k partitions, so it has odd cycles and needs a general (blossom) matching
 def matchingFunc(newGraph):
+    #A vertex with no neighbours can never be matched
+    if any(len(newGraph[v]) == 0 for v in newGraph):
+        return False
     newGraph = fixGraph(newGraph)
-    
-    
-
-    match = {}
-    for v in newGraph.keys():
-        visit = {a: False for a in newGraph.keys()}
-        if v not in match:
-            if not matchableGraph(v,newGraph,match,visit):
-                return False
-
-    return True
-
-
-    
-    
-
-    
-
-
+    if len(newGraph) % 2 == 1:
+        return False
 
+    index = {v: i for i, v in enumerate(newGraph)}
+    adj = [[index[u] for u in newGraph[v]] for v in newGraph]
+    match = maxMatching(adj, stopEarly=True)
+    return all(m != -1 for m in match)
 
 
 #test
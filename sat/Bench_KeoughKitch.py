@@ -0,0 +1,143 @@
+#                    SAT benchmark harness
+# Times a check() function over a table of test cases (the same 4-tuples
+#   [Nvars, NClauses, LitsPerClause, Ntrials] that run_cases takes, with the same
+#   random.seed(ProbNum) wffs) and summarizes every (vars, clauses, k) cell.
+#
+# Each trial is run Warmup times untimed and then Repeats times under
+#   time.perf_counter_ns, on a fresh Assignment each time.  The trial's time is the
+#   median of its repeats; a cell reports the median, p95, min and mean of its trial
+#   times in nanoseconds, the clause/variable ratio, and how many trials were SAT
+#   and UNSAT.  Results are written as JSON.  Every model returned is checked
+#   against its wff, outside the timed part.
+#
+# Compare mode loads a saved JSON baseline and flags every cell whose median got
+#   slower by more than Threshold (a fraction, 0.10 = 10%), or whose SAT/UNSAT
+#   counts changed.  The exit status is 1 if anything was flagged.
+#
+# Example:
+#   python3 Bench_KeoughKitch.py --cases TestCases --out base.json
+#   ... change the solver ...
+#   python3 Bench_KeoughKitch.py --cases TestCases --compare base.json
+
+import sys
+import json
+import random
+import platform
+import argparse
+import importlib
+import statistics
+from time import perf_counter_ns
+
+from Bitmask_KeoughKitch import verify_model
+
+
+def percentile(Sorted, Pct):
+    # Nearest-rank percentile of an already sorted list
+    Rank = max(1, -(-len(Sorted) * Pct // 100))
+    return Sorted[int(Rank) - 1]
+
+
+def time_trial(Check, wff, Nvars, NClauses, Warmup, Repeats):
+    for _ in range(Warmup):
+        Check(wff, Nvars, NClauses, [0] * (Nvars + 2))
+    Times = []
+    Verdicts = set()
+    for _ in range(Repeats):
+        Assignment = [0] * (Nvars + 2)
+        start = perf_counter_ns()
+        SatFlag = Check(wff, Nvars, NClauses, Assignment)
+        Times.append(perf_counter_ns() - start)
+        Verdicts.add(SatFlag)
+        if SatFlag and not verify_model(wff, Nvars, Assignment):
+            raise RuntimeError("check returned an assignment that does not satisfy the wff")
+    if len(Verdicts) != 1:
+        raise RuntimeError("check gave different answers on repeated runs")
+    return Verdicts.pop(), statistics.median(Times)
+
+
+def run_bench(TestCases, ProbNum, Solver='SmartSat_KeoughKitch', Check='check',
+              Warmup=1, Repeats=5):
+    Module = importlib.import_module(Solver)
+    CheckFn = getattr(Module, Check)
+    Cells = []
+    for TestCase in TestCases:
+        Nvars, NClauses, LitsPerClause, Ntrials = TestCase[:4]
+        Times = []
+        Sat = 0
+        for _ in range(Ntrials):
+            random.seed(ProbNum)
+            wff = Module.build_wff(Nvars, NClauses, LitsPerClause)
+            SatFlag, Time = time_trial(CheckFn, wff, Nvars, NClauses, Warmup, Repeats)
+            Sat += bool(SatFlag)
+            Times.append(Time)
+            ProbNum += 1
+        Times.sort()
+        Cells.append({
+            'vars': Nvars, 'clauses': NClauses, 'k': LitsPerClause,
+            'ratio': round(NClauses / Nvars, 4) if Nvars else None,
+            'trials': Ntrials, 'sat': Sat, 'unsat': Ntrials - Sat,
+            'median_ns': statistics.median(Times) if Times else None,
+            'p95_ns': percentile(Times, 95) if Times else None,
+            'min_ns': Times[0] if Times else None,
+            'mean_ns': statistics.fmean(Times) if Times else None,
+        })
+    return {
+        'solver': Solver, 'check': Check, 'warmup': Warmup, 'repeats': Repeats,
+        'python': platform.python_version(), 'machine': platform.machine(),
+        'cells': Cells,
+    }
+
+
+def compare(Current, Baseline, Threshold=0.10):
+    # Returns a list of human readable regression messages
+    Base = {(c['vars'], c['clauses'], c['k']): c for c in Baseline['cells']}
+    Flags = []
+    for Cell in Current['cells']:
+        Key = (Cell['vars'], Cell['clauses'], Cell['k'])
+        Old = Base.get(Key)
+        if Old is None:
+            continue
+        if (Cell['sat'], Cell['unsat']) != (Old['sat'], Old['unsat']):
+            Flags.append(f"{Key}: SAT/UNSAT counts changed "
+                         f"{Old['sat']}/{Old['unsat']} -> {Cell['sat']}/{Cell['unsat']}")
+        if Old['median_ns'] and Cell['median_ns'] > Old['median_ns'] * (1 + Threshold):
+            Flags.append(f"{Key}: median {Old['median_ns'] / 1e3:.1f}us -> "
+                         f"{Cell['median_ns'] / 1e3:.1f}us "
+                         f"(+{100 * (Cell['median_ns'] / Old['median_ns'] - 1):.0f}%)")
+    return Flags
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark a SAT check() over a test case table")
+    parser.add_argument('--solver', default='SmartSat_KeoughKitch', help="module holding check and the tables")
+    parser.add_argument('--check', default='check', help="name of the check function in that module")
+    parser.add_argument('--cases', default='TestCases', help="name of the test case table in that module")
+    parser.add_argument('--probnum', type=int, default=3)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--out', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="baseline JSON file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    TestCases = getattr(importlib.import_module(args.solver), args.cases)
+    Results = run_bench(TestCases, args.probnum, args.solver, args.check, args.warmup, args.repeats)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(Results, f, indent=1)
+    print(f"{'vars':>5} {'clauses':>7} {'k':>2} {'ratio':>6} {'sat':>4} {'unsat':>5} "
+          f"{'median us':>11} {'p95 us':>11}")
+    for c in Results['cells']:
+        print(f"{c['vars']:>5} {c['clauses']:>7} {c['k']:>2} {c['ratio']:>6} {c['sat']:>4} {c['unsat']:>5} "
+              f"{c['median_ns'] / 1e3:>11.1f} {c['p95_ns'] / 1e3:>11.1f}")
+    if args.compare:
+        with open(args.compare) as f:
+            Flags = compare(Results, json.load(f), args.threshold)
+        for Flag in Flags:
+            print("REGRESSION", Flag)
+        return 1 if Flags else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
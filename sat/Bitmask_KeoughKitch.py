@@ -0,0 +1,100 @@
+#                    Bitmask-compiled wffs
+# An assignment to variables 1..Nvars is packed into one int, variable v in bit v-1,
+#   so pack(Assignment) is exactly the binary counter check() in DumbSat counts with.
+#   compile_wff turns each clause into a pair (Flip, Mask): Mask has the bits of its
+#   variables and Flip the bits of the ones that appear negated.  A clause is then
+#   satisfied by Bits exactly when (Bits ^ Flip) & Mask is not 0 -- one XOR and one
+#   AND per clause instead of a lookup and a sign test per literal.
+#
+# Tautologies are dropped (always satisfied); an empty clause compiles to Mask 0 and
+#   is never satisfied.  The ints grow with Nvars, so compiled wffs are meant for the
+#   few dozen variables that enumeration can reach.  verify_model falls back to a
+#   plain literal loop above MaskVars variables, where one clause mask would already
+#   cost more than evaluating the clause directly.
+
+MaskVars = 1024
+
+
+def compile_wff(Wff):
+    # Returns a list of (Flip, Mask), shortest clauses first so failing assignments
+    #   are usually rejected by the first test
+    Compiled = []
+    for Clause in sorted(Wff, key=len):
+        Pos = Neg = 0
+        for l in Clause:
+            if l > 0:
+                Pos |= 1 << (l - 1)
+            else:
+                Neg |= 1 << (-l - 1)
+        if not Pos & Neg:
+            Compiled.append((Neg, Pos | Neg))
+    return Compiled
+
+
+def pack(Assignment, Nvars):
+    Bits = 0
+    for v in range(Nvars, 0, -1):
+        Bits = 2 * Bits + Assignment[v]
+    return Bits
+
+
+def unpack(Bits, Nvars, Assignment):
+    for v in range(1, Nvars + 1):
+        Assignment[v] = (Bits >> (v - 1)) & 1
+
+
+def satisfies(Compiled, Bits):
+    for Flip, Mask in Compiled:
+        if not (Bits ^ Flip) & Mask:
+            return False
+    return True
+
+
+def first_model(Compiled, Start, Stop, Stats=None):
+    # The first packed assignment in [Start, Stop) that satisfies every clause, or None
+    if Stats is not None:
+        return _first_model_counted(Compiled, Start, Stop, Stats)
+    for Bits in range(Start, Stop):
+        for Flip, Mask in Compiled:
+            if not (Bits ^ Flip) & Mask:
+                break
+        else:
+            return Bits
+    return None
+
+
+def _first_model_counted(Compiled, Start, Stop, Stats):
+    Every = Stats.Every if Stats.Callback is not None else 0
+    Found = None
+    Tried = Clauses = 0
+    for Bits in range(Start, Stop):
+        Tried += 1
+        for Flip, Mask in Compiled:
+            Clauses += 1
+            if not (Bits ^ Flip) & Mask:
+                break
+        else:
+            Found = Bits
+            break
+        if Every and Tried % Every == 0:
+            Stats.Assignments += Every
+            Stats.Clauses += Clauses
+            Tried -= Every
+            Clauses = 0
+            Stats.Callback(Stats)
+    Stats.Assignments += Tried
+    Stats.Clauses += Clauses
+    return Found
+
+
+def verify_model(Wff, Nvars, Assignment):
+    # True if Assignment[1..Nvars] satisfies every clause of Wff
+    if Nvars <= MaskVars:
+        return satisfies(compile_wff(Wff), pack(Assignment, Nvars))
+    for Clause in Wff:
+        for l in Clause:
+            if Assignment[abs(l)] == (l > 0):
+                break
+        else:
+            return False
+    return True
@@ -0,0 +1,71 @@
+#                    Compact clause database
+# A ClauseDB holds a wff as one flat buffer of int32 literals plus an index of
+#   clause start offsets, instead of a Python list per clause and a Python int per
+#   literal.  Clause i is Lits[Starts[i]:Starts[i+1]], so Starts has one more entry
+#   than there are clauses.
+#
+# Indexing or iterating a ClauseDB hands out memoryview slices of the buffer,
+#   which support len(), indexing and iteration just like the clause lists used
+#   elsewhere, so check() in DumbSat and SmartSat accept either form unchanged.
+#   The buffers are array('i') / array('q'), or the int32 / int64 NumPy arrays
+#   produced by the DIMACS reader (kept without copying).  append() converts a
+#   NumPy-backed database to arrays the first time it is called, and cannot grow
+#   the buffer while clause views handed out earlier are still alive.
+
+from array import array
+
+
+class ClauseDB:
+    __slots__ = ('Lits', 'Starts')
+
+    def __init__(self, Lits=None, Starts=None):
+        self.Lits = array('i') if Lits is None else Lits
+        self.Starts = array('q', [0]) if Starts is None else Starts
+
+    @classmethod
+    def from_lists(cls, Wff):
+        # Adapter from the list-of-lists form used by build_wff
+        db = cls()
+        for Clause in Wff:
+            db.Lits.extend(Clause)
+            db.Starts.append(len(db.Lits))
+        return db
+
+    def to_lists(self):
+        return [list(Clause) for Clause in self]
+
+    def append(self, Clause):
+        if not isinstance(self.Lits, array):
+            self.Lits = array('i', memoryview(self.Lits).cast('B').tobytes())
+            self.Starts = array('q', memoryview(self.Starts).cast('B').tobytes())
+        self.Lits.extend(Clause)
+        self.Starts.append(len(self.Lits))
+
+    def extend(self, Wff):
+        for Clause in Wff:
+            self.append(Clause)
+
+    def __len__(self):
+        return len(self.Starts) - 1
+
+    def __getitem__(self, i):
+        n = len(self.Starts) - 1
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("clause index out of range")
+        return memoryview(self.Lits)[self.Starts[i]:self.Starts[i + 1]]
+
+    def __iter__(self):
+        View, Starts = memoryview(self.Lits), self.Starts
+        for i in range(len(Starts) - 1):
+            yield View[Starts[i]:Starts[i + 1]]
+
+    def num_literals(self):
+        return self.Starts[len(self.Starts) - 1]
+
+    def max_var(self):
+        return max((abs(l) for l in self.Lits), default=0)
+
+    def __repr__(self):
+        return f"ClauseDB({len(self)} clauses, {self.num_literals()} literals)"
@@ -0,0 +1,79 @@
+#                    Cube-and-conquer
+# check_cubes has the same signature as check() but splits one wff across worker
+#   processes.  Depth split variables are chosen, and each of the 2**Depth sign
+#   combinations of them (a "cube") is solved as a set of assumptions.  Each worker
+#   builds one incremental SmartSat Solver and reuses it, with everything it has
+#   learned, for all the cubes it is handed.  The wff is SAT as soon as any cube is; the
+#   pool is then terminated, cancelling every cube still queued or running.  It
+#   is UNSAT only once every cube has been refuted.
+#
+# Split variables are either the first Depth variables (SplitBy='first') or the
+#   Depth most active ones after a short CDCL probe (SplitBy='activity').  The
+#   probe's learned clauses are shared with the workers, and if the probe
+#   already settles the wff no workers are started at all.
+
+import os
+import itertools
+import multiprocessing
+
+from SmartSat_KeoughKitch import Solver
+
+_Solver = None  # the worker's solver, shared by all of its cubes
+
+
+def _init_worker(Wff, Extra, Nvars):
+    global _Solver
+    _Solver = Solver(Nvars)
+    for clause in itertools.chain(Wff, Extra):
+        _Solver.add_clause(clause)
+
+
+def solve_cube(Cube):
+    if _Solver.solve(Cube):
+        return Cube, _Solver.model
+    return Cube, None
+
+
+def split_vars(Wff, Nvars, Depth, SplitBy='activity', ProbeConflicts=1000):
+    # Returns (split variables, learned clauses, probe result or None)
+    if SplitBy == 'first':
+        return list(range(1, min(Depth, Nvars) + 1)), [], None
+    probe = Solver(Nvars)
+    for clause in Wff:
+        if not probe.add_clause(clause):
+            return [], [], (False, None)
+    status = probe.solve(MaxConflicts=ProbeConflicts)
+    if status is not None:
+        return [], [], (status, probe.model)
+    value, activity, to_int = probe.value, probe.activity, probe.to_int
+    Free = [v for v in range(1, Nvars + 1) if value[2 * to_int[v]] == 0]
+    Free.sort(key=lambda v: -activity[to_int[v]])
+    Learnt = [[probe.ext_lit(l) for l in c] for c in probe.learnts]
+    # Facts found at level 0 during the probe
+    Learnt += [[probe.ext_lit(l)] for l in probe.trail]
+    return Free[:Depth], Learnt, None
+
+
+def check_cubes(Wff, Nvars, Nclauses, Assignment, Depth=None, Workers=None,
+                SplitBy='activity', ProbeConflicts=1000):
+    Workers = Workers or os.cpu_count()
+    if Depth is None:
+        Depth = (Workers - 1).bit_length() + 2  # a few cubes per worker
+    Vars, Learnt, Probe = split_vars(Wff, Nvars, Depth, SplitBy, ProbeConflicts)
+    if Probe is not None:
+        SatFlag, Model = Probe
+        if SatFlag:
+            for v in range(1, Nvars + 1):
+                Assignment[v] = Model[v]
+        return SatFlag
+
+    Cubes = [[v if s else -v for v, s in zip(Vars, Signs)]
+             for Signs in itertools.product((0, 1), repeat=len(Vars))]
+    with multiprocessing.Pool(Workers, initializer=_init_worker,
+                              initargs=(Wff, Learnt, Nvars)) as pool:
+        for Cube, Model in pool.imap_unordered(solve_cube, Cubes):
+            if Model is not None:
+                for v in range(1, Nvars + 1):
+                    Assignment[v] = Model[v]
+                return True  # leaving the with block terminates the other cubes
+    return False
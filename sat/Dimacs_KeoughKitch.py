@@ -0,0 +1,167 @@
+#                    DIMACS CNF reader / writer
+# A DIMACS file holds one or more problems, each introduced by a header line
+#   "p cnf <Nvars> <Nclauses>" and followed by clauses written as whitespace
+#   separated literals terminated by 0.  Lines starting with "c" are comments;
+#   a line starting with "%" (as in the SATLIB benchmarks) ends the clause data.
+#
+# iter_dimacs memory-maps the file and parses it a chunk at a time with NumPy,
+#   so no Python list is built per clause.  Each problem's clauses come back as a
+#   ClauseDB wrapping a flat int32 array of literals (0 terminators removed) and
+#   its clause start offsets, ready to pass to check() as the Wff.  parse_dimacs
+#   does the same for DIMACS text held in memory.
+#
+# DimacsWriter appends wffs to a file through a large write buffer.  The comment
+#   line in front of each wff records the problem number, literals per clause and
+#   the answer (S = satisfiable, U = unsatisfiable, ? = unknown), so generated
+#   sweeps can be archived and their answers read back.
+
+import mmap
+import warnings
+from collections import namedtuple
+
+import numpy as np
+
+from ClauseDB_KeoughKitch import ClauseDB
+
+ChunkSize = 1 << 24  # bytes parsed per step
+
+CnfProblem = namedtuple('CnfProblem', ['Nvars', 'Nclauses', 'Wff', 'Comments'])
+
+
+def _parse_ints(Text):
+    if b',' in Text:  # tolerate comma separated literals
+        Text = Text.replace(b',', b' ')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        try:
+            return np.fromstring(Text, dtype=np.int32, sep=' ')
+        except (DeprecationWarning, ValueError):
+            raise ValueError("malformed clause data in DIMACS file") from None
+
+
+class _Problem:
+    # Clause data of the problem currently being read
+    def __init__(self, Nvars, Nclauses):
+        self.Nvars = Nvars
+        self.Nclauses = Nclauses
+        self.Comments = []
+        self.Parts = []
+        self.Done = False  # set after a "%" line
+
+    def finish(self):
+        Raw = np.concatenate(self.Parts) if self.Parts else np.zeros(0, dtype=np.int32)
+        Ends = np.flatnonzero(Raw == 0)
+        if len(Raw) and (not len(Ends) or Ends[-1] != len(Raw) - 1):
+            Ends = np.append(Ends, len(Raw))  # last clause had no terminating 0
+        Lits = Raw[Raw != 0]
+        Starts = np.zeros(len(Ends) + 1, dtype=np.int64)
+        Starts[1:] = Ends - np.arange(len(Ends))
+        if len(Lits):
+            self.Nvars = max(self.Nvars, int(np.abs(Lits).max()))
+        return CnfProblem(self.Nvars, len(Ends), ClauseDB(Lits, Starts), self.Comments)
+
+
+def iter_dimacs(filename):
+    # Yields one CnfProblem per "p cnf" section of the file, in order
+    with open(filename, 'rb') as f:
+        try:
+            Map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return
+        with Map:
+            yield from _iter_buffer(Map)
+
+
+def parse_dimacs(Text):
+    # Like iter_dimacs, for DIMACS text already in memory (str or bytes); returns a list
+    if isinstance(Text, str):
+        Text = Text.encode('ascii')
+    return list(_iter_buffer(Text))
+
+
+def _iter_buffer(Map):
+    # The parser behind iter_dimacs / parse_dimacs; Map is an mmap or bytes
+    Problem = None
+    Pending = []  # comments not yet attached; they belong to the next header
+    Pos, Size = 0, len(Map)
+    while Pos < Size:
+        End = min(Pos + ChunkSize, Size)
+        if End < Size:  # cut the chunk at a line boundary
+            Cut = Map.rfind(b'\n', Pos, End)
+            if Cut < 0:
+                Cut = Map.find(b'\n', End)
+            End = Size if Cut < 0 else Cut + 1
+        Chunk = Map[Pos:End]
+        Pos = End
+        if (Problem is not None and not Problem.Done and Chunk[:1] not in (b'c', b'p', b'%')
+                and b'\nc' not in Chunk and b'\np' not in Chunk and b'\n%' not in Chunk):
+            Problem.Parts.append(_parse_ints(Chunk))  # fast path: clause data only
+            continue
+        Start = 0  # start of the current run of clause lines
+        LineStart = 0
+        while LineStart < len(Chunk):
+            LineEnd = Chunk.find(b'\n', LineStart)
+            if LineEnd < 0:
+                LineEnd = len(Chunk)
+            First = Chunk[LineStart:LineStart + 1]
+            if First in (b'c', b'p', b'%'):
+                if Problem is not None and not Problem.Done and Start < LineStart:
+                    Problem.Parts.append(_parse_ints(Chunk[Start:LineStart]))
+                Line = Chunk[LineStart:LineEnd].decode('ascii', 'replace').strip()
+                if First == b'c':
+                    Pending.append(Line[1:].strip())
+                elif First == b'%':
+                    if Problem is not None:
+                        Problem.Done = True
+                else:
+                    Fields = Line.split()
+                    if len(Fields) != 4 or Fields[1] != 'cnf':
+                        raise ValueError("bad DIMACS header: " + Line)
+                    if Problem is not None:
+                        yield Problem.finish()
+                    Problem = _Problem(int(Fields[2]), int(Fields[3]))
+                    Problem.Comments, Pending = Pending, []
+                Start = LineEnd + 1
+            LineStart = LineEnd + 1
+        if Problem is not None and not Problem.Done and Start < len(Chunk):
+            Problem.Parts.append(_parse_ints(Chunk[Start:]))
+    if Problem is not None:
+        Problem.Comments += Pending
+        yield Problem.finish()
+
+
+def read_dimacs(filename):
+    # The first problem in the file
+    for Problem in iter_dimacs(filename):
+        return Problem
+    raise ValueError("no 'p cnf' header in " + str(filename))
+
+
+class DimacsWriter:
+    # Buffered writer for one or more wffs; use as a context manager
+    def __init__(self, filename, mode='w', BufferSize=1 << 20):
+        self.file = open(filename, mode, buffering=BufferSize)
+
+    def write_wff(self, Wff, Nvars, ProbNum=None, LitsPerClause=None, SatFlag=None):
+        Answer = '?' if SatFlag is None else ('S' if SatFlag else 'U')
+        Lines = []
+        if ProbNum is not None:
+            Lines.append(f"c {ProbNum} {LitsPerClause or 0} {Answer}\n")
+        Lines.append(f"p cnf {Nvars} {len(Wff)}\n")
+        for Clause in Wff:
+            Lines.append(' '.join(map(str, Clause)) + ' 0\n')
+        self.file.write(''.join(Lines))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_dimacs(filename, Wff, Nvars):
+    with DimacsWriter(filename) as writer:
+        writer.write_wff(Wff, Nvars)
@@ -5,6 +5,8 @@
 #    and each integer within a clause list is a literal
 #    A positive integer such as "3" means that clause is true if variable 3 is true
 #    A negative integer such as "-3" means that clause is true if variable 3 is false
+#    The check functions also accept a ClauseDB (see ClauseDB_KeoughKitch.py),
+#    which stores the same clauses in one flat int32 buffer
 #  A clause is satisfiable if at least one literal is true
 #  A wff is satisfiable if all clauses are satisfiable
 # An assignment to n variables is a list of n 0s or 1s (0=>False, 1=>True)
@@ -15,20 +17,38 @@
 # check takes a wff, generates all possible assignments,
 #   and determines if any assignment satisfies it.
 #   If so it stops and returns the time ans assignment
+# check_vectorized walks the same assignments in the same order, but tests
+#   2**BlockBits of them at a time with NumPy; it returns exactly what check does
+# check_bitmask also walks them in the same order, testing each clause of a
+#   bitmask-compiled wff (see Bitmask_KeoughKitch.py) with one XOR and one AND
+# check_gray enumerates in Gray-code order and updates per-clause true-literal
+#   counts for the one variable flipped at each step
 # test_wff builds a random wff with certain structure
+#   and, unless Verify=False, checks any model it returns against the wff
 #
 # run_cases takes a list of 4-tuples and for each one generates a number of wffs
 #    with the same specified characteristices, and test each one.
-#    It outputs to a file (in current directory) each wff in cnf format,
+#    If given a CnfFile it outputs to that file each wff in DIMACS cnf format,
 #    and also for each case it dumps a row to a .csv file that contains
 #       the test conditions and the satisfying assignment if it exists
+#    The wffs can instead come from iter_wffs in WffGen_KeoughKitch.py, which
+#    generates them in NumPy batches (a different random stream from build_wff)
 
 import time
 import random
 import string
+from contextlib import nullcontext
 
+import numpy as np
 
-def check(Wff, Nvars, Nclauses, Assignment):
+from Dimacs_KeoughKitch import DimacsWriter
+from Bitmask_KeoughKitch import compile_wff, pack, unpack, first_model, verify_model
+from SolverStats_KeoughKitch import SolverStats
+
+
+def check(Wff, Nvars, Nclauses, Assignment, Stats=None):
+    if Stats is not None:
+        return check_counted(Wff, Nvars, Nclauses, Assignment, Stats)
     Satisfiable = False
     while (Assignment[Nvars + 1] == 0):
         # Iterate thru clauses, quit if not satisfiable
@@ -59,6 +79,227 @@ def check(Wff, Nvars, Nclauses, Assignment):
     return Satisfiable
 
 
+def check_counted(Wff, Nvars, Nclauses, Assignment, Stats):
+    # check() with SolverStats counting, kept apart so check() itself pays nothing
+    Satisfiable = False
+    Tried = Clauses = Literals = 0
+    Every = Stats.Every if Stats.Callback is not None else 0
+    while (Assignment[Nvars + 1] == 0):
+        Tried += 1
+        for i in range(0, Nclauses):  # Check i'th clause
+            Clause = Wff[i]
+            Clauses += 1
+            Satisfiable = False
+            for j in range(0, len(Clause)):  # check each literal
+                Literal = Clause[j]
+                Literals += 1
+                if Literal > 0:
+                    Lit = 1
+                else:
+                    Lit = 0
+                VarValue = Assignment[abs(Literal)]  # look up literal's value
+                if Lit == VarValue:
+                    Satisfiable = True
+                    break
+            if not Satisfiable:
+                break
+        if Every and Tried % Every == 0:
+            Stats.Assignments += Tried
+            Stats.Clauses += Clauses
+            Stats.Literals += Literals
+            Tried = Clauses = Literals = 0
+            Stats.Callback(Stats)
+        if Satisfiable:
+            break  # exit if found a satisfying assignment
+        # Last try did not satisfy; generate next assignment
+        for i in range(1, Nvars + 2):
+            if Assignment[i] == 0:
+                Assignment[i] = 1
+                break
+            else:
+                Assignment[i] = 0
+    Stats.Assignments += Tried
+    Stats.Clauses += Clauses
+    Stats.Literals += Literals
+    return Satisfiable
+
+
+def check_vectorized(Wff, Nvars, Nclauses, Assignment, BlockBits=16, Stats=None):
+    # Same search order and result as check(), but tests blocks of 2**BlockBits
+    #   consecutive assignments at a time.  Variables 1..k (the low bits of the
+    #   binary counter) form a fixed bit-matrix that is scored once against the
+    #   dense clause-literal matrices; per block only the high variables change.
+    if Assignment[Nvars + 1] != 0:
+        return False
+    Start = 0
+    for i in range(Nvars, 0, -1):
+        Start = 2 * Start + Assignment[i]
+    if Nclauses == 0:  # check() never reports an empty wff as satisfiable
+        Satisfying = None
+    else:
+        Satisfying = first_satisfying(Wff, Nvars, Nclauses, Start, BlockBits, Stats)
+    if Satisfying is None:
+        for i in range(1, Nvars + 1):
+            Assignment[i] = 0
+        Assignment[Nvars + 1] = 1
+        return False
+    for i in range(1, Nvars + 1):
+        Assignment[i] = (Satisfying >> (i - 1)) & 1
+    return True
+
+
+def first_satisfying(Wff, Nvars, Nclauses, Start, BlockBits, Stats=None):
+    # Pos[c, v] / Neg[c, v] are 1 when clause c contains v+1 / -(v+1)
+    Pos = np.zeros((Nclauses, Nvars), dtype=np.float32)
+    Neg = np.zeros((Nclauses, Nvars), dtype=np.float32)
+    for i in range(Nclauses):
+        for Literal in Wff[i]:
+            if Literal > 0:
+                Pos[i, Literal - 1] = 1
+            else:
+                Neg[i, -Literal - 1] = 1
+
+    # Keep the block x clause matrix to a few million entries
+    k = min(BlockBits, Nvars, max(8, (4 << 20) // Nclauses).bit_length() - 1)
+    Rows = np.arange(1 << k, dtype=np.uint32)
+    Bits = ((Rows[:, None] >> np.arange(k, dtype=np.uint32)) & 1).astype(np.float32)
+    # LowUnsat[r, c] is 1 when no low-variable literal of clause c is true in row r
+    LowUnsat = ((Bits @ Pos[:, :k].T + (1 - Bits) @ Neg[:, :k].T) == 0).astype(np.float32)
+
+    PosHigh, NegHigh = Pos[:, k:], Neg[:, k:]
+    HighShift = np.arange(Nvars - k, dtype=np.int64)
+    for Block in range(Start >> k, 1 << (Nvars - k)):
+        HighBits = ((Block >> HighShift) & 1).astype(np.float32)
+        # Clauses not already satisfied by the high variables of this block
+        Open = ((PosHigh @ HighBits + NegHigh @ (1 - HighBits)) == 0).astype(np.float32)
+        Ok = (LowUnsat @ Open) == 0
+        if Block == Start >> k:
+            Ok[:Start & ((1 << k) - 1)] = False
+        Hits = np.flatnonzero(Ok)
+        if Stats is not None:
+            # Counted per block: every row of the block against each clause still open
+            Skipped = Start & ((1 << k) - 1) if Block == Start >> k else 0
+            Rows = (int(Hits[0]) + 1 if len(Hits) else 1 << k) - Skipped
+            Stats.Assignments += Rows
+            Stats.Clauses += Rows * int(Open.sum())
+            if Stats.Callback is not None and Block % max(1, Stats.Every >> k) == 0:
+                Stats.Callback(Stats)
+        if len(Hits):
+            return (Block << k) + int(Hits[0])
+    return None
+
+
+def check_bitmask(Wff, Nvars, Nclauses, Assignment, Stats=None):
+    # Same search order and result as check(), on the packed-int form of the
+    #   assignment counter and a bitmask-compiled wff
+    if Assignment[Nvars + 1] != 0:
+        return False
+    Found = None
+    if Nclauses > 0:  # check() never reports an empty wff as satisfiable
+        Found = first_model(compile_wff(Wff[i] for i in range(Nclauses)),
+                            pack(Assignment, Nvars), 1 << Nvars, Stats)
+    if Found is None:
+        for i in range(1, Nvars + 1):
+            Assignment[i] = 0
+        Assignment[Nvars + 1] = 1
+        return False
+    unpack(Found, Nvars, Assignment)
+    return True
+
+
+def check_gray(Wff, Nvars, Nclauses, Assignment, Stats=None):
+    # Enumerates all assignments in Gray-code order, so each step flips exactly
+    #   one variable.  TrueCount[i] is the number of true literals in clause i and
+    #   Unsat the number of clauses with none, kept up to date through the
+    #   occurrence lists of the flipped variable.  Gives the same verdict as
+    #   check(), although the satisfying assignment found may differ.
+    if Assignment[Nvars + 1] != 0:
+        return False
+    PosOcc = [[] for _ in range(Nvars + 1)]  # clauses containing v
+    NegOcc = [[] for _ in range(Nvars + 1)]  # clauses containing -v
+    TrueCount = [0] * Nclauses
+    for i in range(0, Nclauses):
+        for Literal in Wff[i]:
+            if Literal > 0:
+                PosOcc[Literal].append(i)
+            else:
+                NegOcc[-Literal].append(i)
+            if (Literal > 0) == (Assignment[abs(Literal)] == 1):
+                TrueCount[i] += 1
+    Unsat = TrueCount.count(0)
+    if Stats is not None:
+        Stats.Assignments += 1
+        Stats.Clauses += Nclauses
+        Stats.Literals += sum(len(Wff[i]) for i in range(Nclauses))
+    if Unsat == 0 and Nclauses > 0:
+        return True
+
+    if Stats is not None:
+        return gray_counted(Nvars, Nclauses, Assignment, Stats, PosOcc, NegOcc, TrueCount, Unsat)
+    if Nclauses > 0:  # check() never reports an empty wff as satisfiable
+        for Step in range(1, 1 << Nvars):
+            Var = (Step & -Step).bit_length()  # variable flipped by this Gray step
+            if Assignment[Var] == 0:
+                Assignment[Var] = 1
+                Up, Down = PosOcc[Var], NegOcc[Var]
+            else:
+                Assignment[Var] = 0
+                Up, Down = NegOcc[Var], PosOcc[Var]
+            for i in Up:
+                TrueCount[i] += 1
+                if TrueCount[i] == 1:
+                    Unsat -= 1
+            for i in Down:
+                TrueCount[i] -= 1
+                if TrueCount[i] == 0:
+                    Unsat += 1
+            if Unsat == 0:
+                return True
+
+    # Leave Assignment in the same exhausted state check() does
+    for i in range(1, Nvars + 1):
+        Assignment[i] = 0
+    Assignment[Nvars + 1] = 1
+    return False
+
+
+def gray_counted(Nvars, Nclauses, Assignment, Stats, PosOcc, NegOcc, TrueCount, Unsat):
+    # The Gray-code loop of check_gray() with SolverStats counting; a "clause
+    #   visit" here is one true-literal counter update
+    Every = Stats.Every if Stats.Callback is not None else 0
+    Step = Reported = 0
+    if Nclauses > 0:
+        for Step in range(1, 1 << Nvars):
+            Var = (Step & -Step).bit_length()
+            if Assignment[Var] == 0:
+                Assignment[Var] = 1
+                Up, Down = PosOcc[Var], NegOcc[Var]
+            else:
+                Assignment[Var] = 0
+                Up, Down = NegOcc[Var], PosOcc[Var]
+            Stats.Clauses += len(Up) + len(Down)
+            for i in Up:
+                TrueCount[i] += 1
+                if TrueCount[i] == 1:
+                    Unsat -= 1
+            for i in Down:
+                TrueCount[i] -= 1
+                if TrueCount[i] == 0:
+                    Unsat += 1
+            if Every and Step % Every == 0:
+                Stats.Assignments += Step - Reported
+                Reported = Step
+                Stats.Callback(Stats)
+            if Unsat == 0:
+                Stats.Assignments += Step - Reported
+                return True
+    Stats.Assignments += Step - Reported
+    for i in range(1, Nvars + 1):
+        Assignment[i] = 0
+    Assignment[Nvars + 1] = 1
+    return False
+
+
 def build_wff(Nvars, Nclauses, LitsPerClause):
     wff = []
     for _ in range(1, Nclauses + 1):
@@ -72,19 +313,33 @@ def build_wff(Nvars, Nclauses, LitsPerClause):
     return wff
 
 
-def test_wff(wff, Nvars, Nclauses):
+def test_wff(wff, Nvars, Nclauses, Check=check, Stats=None, Verify=True):
     Assignment = list((0 for _ in range(Nvars + 2)))
     start = time.time()  # Start timer
-    SatFlag = check(wff, Nvars, Nclauses, Assignment)
+    if Stats is None:
+        SatFlag = Check(wff, Nvars, Nclauses, Assignment)
+    else:
+        SatFlag = Check(wff, Nvars, Nclauses, Assignment, Stats=Stats)
     end = time.time()  # End timer
     exec_time = int((end - start) * 1e6)
+    if Verify and SatFlag and not verify_model(wff, Nvars, Assignment):
+        Name = getattr(Check, '__name__', repr(Check))
+        raise RuntimeError(f"{Name} returned an assignment that does not satisfy the wff")
     return [wff, Assignment, SatFlag, exec_time]
 
 
-def run_cases(TestCases, ProbNum, tablefile):
-    # Open table file to write results
-    with open(tablefile + ".csv", 'w') as tablef:
-        tablef.write("Clauses, SAT Time Taken (us), UNSAT Time Taken (us)\n")  # Table header
+def run_cases(TestCases, ProbNum, tablefile, Check=check, CnfFile=None, Counters=False, Wffs=None):
+    # Open table file to write results (and, if CnfFile is given, archive every wff there)
+    #   With Counters=True each row also gets the SolverStats counters of its trial
+    #   Wffs, if given, supplies the wffs in trial order (e.g. iter_wffs from
+    #   WffGen_KeoughKitch) instead of random.seed(ProbNum) + build_wff
+    Wffs = None if Wffs is None else iter(Wffs)
+    with open(tablefile + ".csv", 'w') as tablef, \
+            (DimacsWriter(CnfFile + ".cnf") if CnfFile else nullcontext()) as cnff:
+        Header = "Clauses, SAT Time Taken (us), UNSAT Time Taken (us)"
+        if Counters:
+            Header += ", " + SolverStats.csv_header()
+        tablef.write(Header + "\n")  # Table header
 
         for i in range(len(TestCases)):
             TestCase = TestCases[i]
@@ -94,17 +349,24 @@ def run_cases(TestCases, ProbNum, tablefile):
             Ntrials = TestCase[3]
 
             for j in range(Ntrials):
-                random.seed(ProbNum)
-                wff = build_wff(Nvars, NClauses, LitsPerClause)
-                results = test_wff(wff, Nvars, NClauses)
+                if Wffs is None:
+                    random.seed(ProbNum)
+                    wff = build_wff(Nvars, NClauses, LitsPerClause)
+                else:
+                    wff = next(Wffs)
+                Stats = SolverStats() if Counters else None
+                results = test_wff(wff, Nvars, NClauses, Check, Stats)
                 Exec_Time = results[3]
+                if cnff is not None:
+                    cnff.write_wff(wff, Nvars, ProbNum, LitsPerClause, results[2])
+                Extra = "," + Stats.csv_row() if Counters else ""
 
                 if results[2]:  # Satisfiable
                     # Write SAT time
-                    tablef.write(f"{NClauses},{Exec_Time},\n")
+                    tablef.write(f"{NClauses},{Exec_Time},{Extra}\n")
                 else:  # Unsatisfiable
                     # Write UNSAT time
-                    tablef.write(f"{NClauses},,{Exec_Time}\n")
+                    tablef.write(f"{NClauses},,{Exec_Time}{Extra}\n")
 
                 # Increment problem number
                 ProbNum += 1
@@ -136,5 +398,18 @@ tracefile = r'tracefile'
 cnffile = r'cnffile'
 summaryfile = 'dumbOutput_KeoughKitch'  # Name of the summary output file
 
+# Larger rows that are only practical with check_vectorized
+VectorCases = [
+    [20,40,3,10],
+    [22,44,3,10],
+    [24,48,3,10],
+    [26,52,3,10],
+    [28,56,3,10],
+]
+
 # Run the function with the test cases
-run_cases(TestCases, ProbNum, summaryfile)
+if __name__ == "__main__":
+    run_cases(TestCases, ProbNum, summaryfile)
+    # run_cases(VectorCases, ProbNum, 'dumbVectorOutput_KeoughKitch', check_vectorized)
+    # run_cases(TestCases, ProbNum, 'dumbGrayOutput_KeoughKitch', check_gray)
+    # run_cases(TestCases, ProbNum, 'dumbBitmaskOutput_KeoughKitch', check_bitmask)
@@ -0,0 +1,219 @@
+#                    Stochastic local search (probSAT / WalkSAT)
+# An incomplete solver for large satisfiable wffs.  It starts from a random full
+#   assignment and repeatedly picks a random unsatisfied clause and flips one of its
+#   variables, until no clause is unsatisfied or the flip budget is spent.  It can
+#   find a model but never prove UNSAT, so check_local() returning False only means
+#   "not found within MaxFlips"; use check_portfolio() for a complete answer.
+#
+# Which variable of the clause is flipped:
+#   Method='probsat'  each with probability proportional to f(break), where break is
+#                     how many clauses would become unsatisfied.  f is (Eps + b)**-Cb
+#                     when the longest clause has 3 literals and Cb**-b otherwise,
+#                     with the constants from Balint & Schoening's probSAT.
+#   Method='walksat'  a variable with break 0 if there is one; otherwise with
+#                     probability Noise a random one, else one with the least break.
+#
+# Everything the inner loop touches is a flat list indexed by clause, variable or
+#   literal (literal l is 2*abs(l) + (l < 0), as in TwoSat_KeoughKitch):
+#   NumTrue[c]  true literals in clause c     Crit[c]  the one true var when NumTrue[c] == 1
+#   Break[v]    clauses in which v is Crit     Flips[v] times v has been flipped
+#   Unsat       unsatisfied clauses, with Where[c] the position of c in it (or -1)
+#   so a flip only visits the clauses containing the flipped variable.
+#
+# Example:
+#   Assignment = [0] * (Nvars + 2)
+#   if check_local(Wff, Nvars, len(Wff), Assignment, MaxFlips=10**7, Seed=1): ...
+
+import time
+import random
+
+from SmartSat_KeoughKitch import Solver, check
+
+ProbSatCb = {3: 2.38, 4: 3.0, 5: 3.7, 6: 5.1}  # by longest clause; 7 and up use 5.4
+
+
+class LocalSearch:
+    def __init__(self, Wff, Nvars, Seed=None, Method='probsat', Cb=None, Eps=1.0, Noise=0.567):
+        self.rng = random.Random(Seed)
+        self.Method = Method
+        self.Noise = Noise
+        Clauses = []
+        self.ok = True  # False when there is an empty clause and no model exists
+        for Clause in Wff:
+            Lits = set(Clause)
+            if any(-l in Lits for l in Lits):
+                continue  # tautology: always satisfied
+            if not Lits:
+                self.ok = False
+            Clauses.append([2 * abs(l) + (l < 0) for l in Lits])
+        self.Clauses = Clauses
+        self.Nvars = max([Nvars] + [Lit >> 1 for Clause in Clauses for Lit in Clause])
+        N = self.Nvars
+        self.Occ = [[] for _ in range(2 * N + 2)]  # clauses containing each literal
+        for c, Clause in enumerate(Clauses):
+            for Lit in Clause:
+                self.Occ[Lit].append(c)
+
+        self.Value = [0] + [self.rng.getrandbits(1) for _ in range(N)]
+        # IsTrue[Lit] caches the truth of every literal under Value
+        self.IsTrue = [0] * (2 * N + 2)
+        for v in range(1, N + 1):
+            self.IsTrue[2 * v] = self.Value[v]
+            self.IsTrue[2 * v + 1] = 1 - self.Value[v]
+        self.NumTrue = [0] * len(Clauses)
+        self.Crit = [0] * len(Clauses)
+        self.Break = [0] * (N + 1)
+        self.Flips = [0] * (N + 1)
+        self.Unsat = []
+        self.Where = [-1] * len(Clauses)
+        for c, Clause in enumerate(Clauses):
+            TrueLits = [Lit for Lit in Clause if self.IsTrue[Lit]]
+            self.NumTrue[c] = len(TrueLits)
+            if len(TrueLits) == 1:
+                self.Crit[c] = TrueLits[0] >> 1
+                self.Break[TrueLits[0] >> 1] += 1
+            elif not TrueLits:
+                self.Where[c] = len(self.Unsat)
+                self.Unsat.append(c)
+        self.TotalFlips = 0
+
+        # Selection weight of a variable by its break count
+        Longest = max((len(Clause) for Clause in Clauses), default=3)
+        MaxBreak = max((len(Occ) for Occ in self.Occ), default=0)
+        if Longest <= 3:
+            Cb = ProbSatCb[3] if Cb is None else Cb
+            self.Weight = [(Eps + b) ** -Cb for b in range(MaxBreak + 1)]
+        else:
+            Cb = ProbSatCb.get(Longest, 5.4) if Cb is None else Cb
+            self.Weight = [Cb ** -b for b in range(MaxBreak + 1)]
+
+    def flip(self, v):
+        IsTrue, NumTrue, Crit, Break = self.IsTrue, self.NumTrue, self.Crit, self.Break
+        Unsat, Where = self.Unsat, self.Where
+        Old = 2 * v + (1 - self.Value[v])  # the literal of v that is true now
+        New = Old ^ 1
+        self.Value[v] ^= 1
+        IsTrue[Old] = 0
+        IsTrue[New] = 1
+        self.Flips[v] += 1
+        for c in self.Occ[New]:
+            n = NumTrue[c]
+            NumTrue[c] = n + 1
+            if n == 0:  # c becomes satisfied, by v alone
+                Last = Unsat.pop()
+                if Last != c:
+                    Unsat[Where[c]] = Last
+                    Where[Last] = Where[c]
+                Where[c] = -1
+                Crit[c] = v
+                Break[v] += 1
+            elif n == 1:
+                Break[Crit[c]] -= 1
+        for c in self.Occ[Old]:
+            n = NumTrue[c]
+            NumTrue[c] = n - 1
+            if n == 1:  # c becomes unsatisfied
+                Where[c] = len(Unsat)
+                Unsat.append(c)
+                Break[v] -= 1
+            elif n == 2:  # one true literal left: it becomes critical
+                for Lit in self.Clauses[c]:
+                    if IsTrue[Lit]:
+                        w = Lit >> 1
+                        Crit[c] = w
+                        Break[w] += 1
+                        break
+
+    def pick(self, Clause):
+        Break = self.Break
+        if self.Method == 'walksat':
+            Best = []
+            Least = None
+            for Lit in Clause:
+                b = Break[Lit >> 1]
+                if Least is None or b < Least:
+                    Least, Best = b, [Lit >> 1]
+                elif b == Least:
+                    Best.append(Lit >> 1)
+            if Least > 0 and self.rng.random() < self.Noise:
+                return self.rng.choice(Clause) >> 1
+            return self.rng.choice(Best)
+        Weight = self.Weight
+        Weights = [Weight[Break[Lit >> 1]] for Lit in Clause]
+        r = self.rng.random() * sum(Weights)
+        for Lit, w in zip(Clause, Weights):
+            r -= w
+            if r <= 0:
+                return Lit >> 1
+        return Clause[-1] >> 1
+
+    def run(self, MaxFlips, Stats=None):
+        # True once every clause is satisfied; False if MaxFlips more flips did not get there.
+        #   Can be called again to continue the same walk with a further budget.
+        if not self.ok:
+            return False
+        Unsat, Clauses, rng = self.Unsat, self.Clauses, self.rng
+        Done = 0
+        while Unsat and Done < MaxFlips:
+            Chunk = min(MaxFlips - Done, Stats.Every if Stats is not None else MaxFlips)
+            Start = Done
+            while Unsat and Done < Start + Chunk:
+                self.flip(self.pick(Clauses[Unsat[int(rng.random() * len(Unsat))]]))
+                Done += 1
+            if Stats is not None:
+                Stats.Assignments += Done - Start
+                if Stats.Callback is not None:
+                    Stats.Callback(Stats)
+        self.TotalFlips += Done
+        return not Unsat
+
+    def model(self, Assignment, Nvars):
+        for v in range(1, Nvars + 1):
+            Assignment[v] = self.Value[v]
+
+
+def check_local(Wff, Nvars, Nclauses, Assignment, Stats=None, MaxFlips=None, Seed=None, Method='probsat'):
+    # Same interface as check(), but False means no model was found within MaxFlips
+    #   (default 100 flips per variable), not that the wff is UNSAT
+    search = LocalSearch(Wff, Nvars, Seed=Seed, Method=Method)
+    if MaxFlips is None:
+        MaxFlips = 100 * search.Nvars + 1000
+    if not search.run(MaxFlips, Stats):
+        return False
+    search.model(Assignment, Nvars)
+    return True
+
+
+def check_portfolio(Wff, Nvars, Nclauses, Assignment, Stats=None, Seed=None, Method='probsat',
+                    FirstConflicts=100, FlipChunk=1000):
+    # Complete check() that alternates the SmartSat CDCL engine with local search, each
+    #   resuming where it left off.  CDCL gets a conflict budget that doubles every round
+    #   and local search then gets as much time as that round of CDCL took, so a
+    #   satisfiable wff is usually settled by local search and an UNSAT one by CDCL,
+    #   in about twice the time the faster of the two would need alone.
+    #   Stats counts flips as Assignments alongside the CDCL decisions.
+    if all(len(Clause) <= 2 for Clause in Wff):
+        return check(Wff, Nvars, Nclauses, Assignment, Stats)
+    search = LocalSearch(Wff, Nvars, Seed=Seed, Method=Method)
+    if not search.ok:
+        return False
+    solver = Solver(Nvars)
+    for clause in Wff:
+        if not solver.add_clause(clause):
+            return False
+    Budget = FirstConflicts
+    while True:
+        Start = time.perf_counter()
+        SatFlag = solver.solve(MaxConflicts=Budget, Stats=Stats)
+        if SatFlag is not None:
+            if SatFlag:
+                for v in range(1, Nvars + 1):
+                    Assignment[v] = solver.model[v]
+            return SatFlag
+        Slice = time.perf_counter() - Start
+        Start = time.perf_counter()
+        while time.perf_counter() - Start < Slice:
+            if search.run(FlipChunk, Stats):
+                search.model(Assignment, Nvars)
+                return True
+        Budget *= 2
@@ -0,0 +1,183 @@
+#                    Exact model counting
+# count_models returns how many of the 2**Nvars assignments satisfy a wff, without
+#   enumerating them.  It is a DPLL search that sums over both values of each
+#   decision variable instead of stopping at the first model, with three savings:
+#   - unit propagation after every decision, so forced variables are not branched on
+#   - the remaining clauses are split into connected components (clauses linked by
+#     shared variables), which are counted separately and multiplied together
+#   - every component's count is cached, keyed on its sorted clauses, so a
+#     component reached again through a different sequence of decisions is not
+#     counted twice
+#   Variables that drop out of every clause without being assigned are free and
+#   multiply the count by 2 each.  Decisions pick the variable of the component
+#   with the highest Jeroslow-Wang score (each clause adds 2**-length), which
+#   favours variables in short clauses.
+#
+# The cache is an LRU of at most MaxCache components, so memory stays bounded on
+#   long runs.  A ModelCounter keeps its cache between count() calls; a component's
+#   count does not depend on the wff it came from, so entries stay valid.
+#   Recursion goes about two frames per decision, so wffs needing more than a few
+#   hundred nested decisions hit Python's recursion limit.
+#
+# Random 3-SAT with 100 variables counts in a few seconds from about 3.5 clauses
+#   per variable up; below that the formula rarely splits into components and the
+#   search grows quickly (50 variables at ratio 2 still takes about a second).
+#
+# Example:
+#   count_models([[1, 2], [-1, 3]], 3)                 # 4
+#   count_cases(TestCases, ProbNum, 'countOutput_KeoughKitch')
+
+import time
+import random
+from collections import OrderedDict
+
+from SmartSat_KeoughKitch import build_wff, TestCases, ProbNum
+
+
+def _vars(Clauses):
+    return {abs(l) for Clause in Clauses for l in Clause}
+
+
+def _assign(Clauses, Lits):
+    # Clauses with every literal in Lits made true; None if a clause becomes empty
+    Out = []
+    Negated = {-l for l in Lits}
+    for Clause in Clauses:
+        if not Lits.isdisjoint(Clause):
+            continue  # satisfied
+        if Negated.isdisjoint(Clause):
+            Out.append(Clause)
+        else:
+            Clause = tuple(l for l in Clause if l not in Negated)
+            if not Clause:
+                return None
+            Out.append(Clause)
+    return Out
+
+
+def propagate(Clauses, Lits):
+    # Makes Lits true and unit-propagates.  Returns (clauses left, number of variables
+    #   assigned), or (None, 0) on a conflict.
+    Assigned = set()
+    while Lits:
+        if any(-l in Lits for l in Lits):
+            return None, 0
+        Assigned |= Lits
+        Clauses = _assign(Clauses, Lits)
+        if Clauses is None:
+            return None, 0
+        Lits = {Clause[0] for Clause in Clauses if len(Clause) == 1}
+    return Clauses, len(Assigned)
+
+
+def components(Clauses):
+    # Splits Clauses into lists that share no variable (union-find over variables)
+    Parent = {abs(l): abs(l) for Clause in Clauses for l in Clause}
+    for Clause in Clauses:
+        Root = abs(Clause[0])
+        while Parent[Root] != Root:
+            Root = Parent[Root]
+        for l in Clause:
+            v = abs(l)
+            while Parent[v] != v:
+                Parent[v] = Parent[Parent[v]]
+                v = Parent[v]
+            if v != Root:
+                Parent[v] = Root
+    Groups = {}
+    for Clause in Clauses:
+        v = abs(Clause[0])
+        while Parent[v] != v:
+            v = Parent[v]
+        Groups.setdefault(v, []).append(Clause)
+    return list(Groups.values())
+
+
+class ModelCounter:
+    def __init__(self, MaxCache=100000):
+        self.MaxCache = MaxCache
+        self.Cache = OrderedDict()  # sorted clause tuple -> model count over its variables
+        self.Hits = 0
+        self.Misses = 0
+        self.Decisions = 0
+
+    def count(self, Wff, Nvars):
+        # Number of assignments to variables 1..Nvars (and any higher ones in Wff)
+        #   that satisfy Wff
+        Clauses = []
+        for Clause in Wff:
+            Lits = set(Clause)
+            if not any(-l in Lits for l in Lits):  # tautologies constrain nothing
+                Clauses.append(tuple(sorted(Lits)))
+        Nmax = max([Nvars] + list(_vars(Clauses)))
+        if () in Clauses:
+            return 0
+        Units = {Clause[0] for Clause in Clauses if len(Clause) == 1}
+        Clauses, Assigned = propagate(Clauses, Units)
+        if Clauses is None:
+            return 0
+        Free = Nmax - Assigned - len(_vars(Clauses))
+        return (1 << Free) * self._count_split(Clauses)
+
+    def _count_split(self, Clauses):
+        Total = 1
+        for Component in components(Clauses):
+            Total *= self._count_component(Component)
+            if not Total:
+                break
+        return Total
+
+    def _count_component(self, Clauses):
+        if len(Clauses) == 1:
+            return (1 << len(Clauses[0])) - 1  # all but the one falsifying assignment
+        Key = tuple(sorted(Clauses))
+        Count = self.Cache.get(Key)
+        if Count is not None:
+            self.Cache.move_to_end(Key)
+            self.Hits += 1
+            return Count
+        self.Misses += 1
+
+        Score = {}  # Jeroslow-Wang: each clause adds 2**-len to its variables
+        for Clause in Clauses:
+            w = 1.0 / (1 << len(Clause))
+            for l in Clause:
+                Score[abs(l)] = Score.get(abs(l), 0) + w
+        Var = max(Score, key=Score.get)
+        Count = 0
+        for Lit in (Var, -Var):
+            self.Decisions += 1
+            Rest, Assigned = propagate(Clauses, {Lit})
+            if Rest is None:
+                continue
+            Free = len(Score) - Assigned - len(_vars(Rest))
+            Count += (1 << Free) * self._count_split(Rest)
+
+        self.Cache[Key] = Count
+        if len(self.Cache) > self.MaxCache:
+            self.Cache.popitem(last=False)
+        return Count
+
+
+def count_models(Wff, Nvars, MaxCache=100000):
+    return ModelCounter(MaxCache).count(Wff, Nvars)
+
+
+def count_cases(TestCases, ProbNum, tablefile, MaxCache=100000):
+    # Counts the models of the same random.seed(ProbNum) wffs run_cases solves
+    counter = ModelCounter(MaxCache)
+    with open(tablefile + ".csv", 'w') as tablef:
+        tablef.write("Vars, Clauses, Literals/Clause, ProbNum, Models, Time Taken (us)\n")
+        for Nvars, NClauses, LitsPerClause, Ntrials in TestCases:
+            for _ in range(Ntrials):
+                random.seed(ProbNum)
+                wff = build_wff(Nvars, NClauses, LitsPerClause)
+                start = time.time()
+                Models = counter.count(wff, Nvars)
+                Time = int((time.time() - start) * 1e6)
+                tablef.write(f"{Nvars},{NClauses},{LitsPerClause},{ProbNum},{Models},{Time}\n")
+                ProbNum += 1
+
+
+if __name__ == "__main__":
+    count_cases(TestCases, ProbNum, 'countOutput_KeoughKitch')
@@ -0,0 +1,78 @@
+#                    Parallel run_cases
+# Runs the same sweep as run_cases in DumbSat_KeoughKitch.py / SmartSat_KeoughKitch.py,
+#   but hands every trial to a pool of worker processes.
+# Each job is (Solver, Check, Nvars, NClauses, LitsPerClause, ProbNum, Timeout).
+#   The worker seeds its own RNG with random.seed(ProbNum) before build_wff, exactly
+#   like the serial loop, so every trial solves the same wff it would have serially.
+# Rows are written to the summary csv in the original trial order as soon as they
+#   are ready.  A trial that runs longer than Timeout seconds is stopped inside its
+#   worker and recorded in the "Timed Out" column instead of holding up the sweep.
+
+import os
+import random
+import signal
+import importlib
+import multiprocessing
+
+
+class TrialTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise TrialTimeout()
+
+
+def _init_worker():
+    signal.signal(signal.SIGALRM, _raise_timeout)
+
+
+def solve_case(Job):
+    Solver, Check, Nvars, NClauses, LitsPerClause, ProbNum, Timeout = Job
+    Module = importlib.import_module(Solver)
+    random.seed(ProbNum)
+    wff = Module.build_wff(Nvars, NClauses, LitsPerClause)
+    if Timeout:
+        signal.setitimer(signal.ITIMER_REAL, Timeout)
+    try:
+        results = Module.test_wff(wff, Nvars, NClauses, getattr(Module, Check))
+        if Timeout:
+            # Disarm inside the try, so an alarm that fires just after test_wff returns
+            #   is still caught below as a timeout
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except TrialTimeout:
+        return (NClauses, None, int(Timeout * 1e6))
+    finally:
+        if Timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return (NClauses, results[2], results[3])
+
+
+def make_jobs(TestCases, ProbNum, Solver, Check, Timeout):
+    for TestCase in TestCases:
+        Nvars, NClauses, LitsPerClause, Ntrials = TestCase[:4]
+        for _ in range(Ntrials):
+            yield (Solver, Check, Nvars, NClauses, LitsPerClause, ProbNum, Timeout)
+            ProbNum += 1
+
+
+def run_cases_parallel(TestCases, ProbNum, tablefile, Solver='SmartSat_KeoughKitch',
+                       Check='check', Workers=None, Timeout=None):
+    Jobs = make_jobs(TestCases, ProbNum, Solver, Check, Timeout)
+    with open(tablefile + ".csv", 'w') as tablef, \
+            multiprocessing.Pool(Workers or os.cpu_count(), initializer=_init_worker) as pool:
+        tablef.write("Clauses, SAT Time Taken (us), UNSAT Time Taken (us), Timed Out (us)\n")
+        for NClauses, SatFlag, Exec_Time in pool.imap(solve_case, Jobs, chunksize=1):
+            if SatFlag is None:
+                tablef.write(f"{NClauses},,,{Exec_Time}\n")
+            elif SatFlag:
+                tablef.write(f"{NClauses},{Exec_Time},,\n")
+            else:
+                tablef.write(f"{NClauses},,{Exec_Time},\n")
+            tablef.flush()
+
+
+if __name__ == "__main__":
+    import SmartSat_KeoughKitch
+    run_cases_parallel(SmartSat_KeoughKitch.TestCases, SmartSat_KeoughKitch.ProbNum,
+                       'smartParallelOutput_KeoughKitch', Timeout=60)
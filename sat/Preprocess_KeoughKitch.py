@@ -0,0 +1,237 @@
+#                    CNF preprocessing
+# preprocess(Wff, Nvars) simplifies a wff before search and returns
+#   (Satisfiable, Reduced, Stack):
+#     Satisfiable  False if preprocessing alone refuted the wff, else True
+#     Reduced      a ClauseDB with the simplified clauses (same variable numbers)
+#     Stack        model-reconstruction stack for extend_model()
+#   The reduced wff is satisfiable exactly when the original is, and any model of it
+#   can be turned into a model of the original with extend_model(Stack, Assignment).
+#
+# The rounds below repeat until nothing changes (or Rounds is reached):
+#   - duplicate literals (build_wff makes clauses like [2,3,3]) and tautologies
+#     such as [1,-1,4] are dropped as clauses are loaded
+#   - unit propagation and pure-literal elimination, iterated to a fixpoint
+#   - subsumption: a clause that contains another clause is removed
+#   - self-subsuming resolution: if C = A + [l] and D contains A and -l, then -l
+#     is removed from D
+#   - bounded variable elimination: a variable is replaced by all non-tautological
+#     resolvents of its clauses when that does not increase the number of clauses
+#
+# Stack entries are (Witness, Clause).  extend_model walks the stack backwards and,
+#   whenever Clause is not satisfied by the model so far, makes Witness true.
+#   Fixed and pure literals are recorded as (l, (l,)).  Eliminating v records v's
+#   positive clauses with witness v followed by (-v, (-v,)), so v defaults to false
+#   and is set true only if one of its positive clauses needs it.
+#
+# SmartSat's check() runs this when called with Simplify=True.  It is off by default:
+#   on the small random wffs in TestCases building the occurrence lists costs more
+#   than the search it saves, and Eliminate=False (units and pure literals only)
+#   is the cheaper middle ground.  It starts to pay off on wffs of a few hundred
+#   clauses that take CDCL real work.
+
+from collections import defaultdict
+
+from ClauseDB_KeoughKitch import ClauseDB
+
+
+class Simplifier:
+    ResolventLimit = 20    # longest resolvent allowed during variable elimination
+    ProductLimit = 400     # skip variables with more than this many candidate resolvents
+    CandidateLimit = 2000  # skip subsumption checks against huge occurrence lists
+
+    def __init__(self, Nvars):
+        self.Nvars = Nvars
+        self.Clauses = []            # clause id -> set of literals, None once removed
+        self.Sigs = []               # clause id -> bit signature of its variables
+        self.Occ = defaultdict(set)  # literal -> ids of the clauses containing it
+        self.Done = [False] * (Nvars + 1)  # variable fixed or eliminated
+        self.Units = []
+        self.Touched = set()         # clauses to (re)use for subsumption
+        self.Stack = []
+        self.ok = True
+
+    def add(self, Lits):
+        C = set(Lits)
+        if any(-l in C for l in C):
+            return  # tautology
+        if not C:
+            self.ok = False
+            return
+        i = len(self.Clauses)
+        self.Clauses.append(C)
+        self.Sigs.append(self.signature(C))
+        for l in C:
+            self.Occ[l].add(i)
+        if len(C) == 1:
+            self.Units.append(i)
+        self.Touched.add(i)
+
+    @staticmethod
+    def signature(C):
+        # C can only subsume (or strengthen) D if sig(C) & ~sig(D) == 0
+        Sig = 0
+        for l in C:
+            Sig |= 1 << (abs(l) & 63)
+        return Sig
+
+    def remove(self, i):
+        for l in self.Clauses[i]:
+            self.Occ[l].discard(i)
+        self.Clauses[i] = None
+
+    def strengthen(self, i, l):
+        C = self.Clauses[i]
+        C.discard(l)
+        self.Occ[l].discard(i)
+        if not C:
+            self.ok = False
+        elif len(C) == 1:
+            self.Units.append(i)
+        self.Sigs[i] = self.signature(C)
+        self.Touched.add(i)
+
+    def assign(self, l):
+        self.Stack.append((l, (l,)))
+        self.Done[abs(l)] = True
+        for i in list(self.Occ[l]):
+            self.remove(i)
+        for i in list(self.Occ[-l]):
+            self.strengthen(i, -l)
+
+    def propagate(self):
+        Changed = False
+        while self.Units and self.ok:
+            C = self.Clauses[self.Units.pop()]
+            if C is not None and len(C) == 1:
+                self.assign(next(iter(C)))
+                Changed = True
+        return Changed
+
+    def pure_literals(self):
+        Changed = False
+        Occ = self.Occ
+        for v in range(1, self.Nvars + 1):
+            if self.Done[v]:
+                continue
+            if Occ[v] and not Occ[-v]:
+                self.assign(v)
+                Changed = True
+            elif Occ[-v] and not Occ[v]:
+                self.assign(-v)
+                Changed = True
+        return Changed
+
+    def subsume(self):
+        Changed = False
+        Clauses, Occ, Sigs = self.Clauses, self.Occ, self.Sigs
+        while self.Touched and self.ok:
+            Queue = sorted(self.Touched, key=lambda i: len(Clauses[i]) if Clauses[i] is not None else 0)
+            self.Touched = set()
+            for i in Queue:
+                C = Clauses[i]
+                if not self.ok:
+                    break
+                if C is None:
+                    continue
+                Pivot = min(C, key=lambda l: len(Occ[l]) + len(Occ[-l]))
+                Candidates = Occ[Pivot] | Occ[-Pivot]
+                if len(Candidates) > self.CandidateLimit:
+                    continue
+                Sig, Size = Sigs[i], len(C)
+                for j in Candidates:
+                    D = Clauses[j]
+                    if j == i or D is None or Sig & ~Sigs[j] or len(D) < Size:
+                        continue
+                    Missing = [l for l in C if l not in D]
+                    if not Missing:
+                        self.remove(j)  # C subsumes D
+                        Changed = True
+                    elif len(Missing) == 1 and -Missing[0] in D:
+                        self.strengthen(j, -Missing[0])  # self-subsuming resolution
+                        Changed = True
+            self.propagate()
+        return Changed
+
+    def eliminate(self):
+        Changed = False
+        Clauses, Occ = self.Clauses, self.Occ
+        Order = sorted((v for v in range(1, self.Nvars + 1) if not self.Done[v]),
+                       key=lambda v: len(Occ[v]) * len(Occ[-v]))
+        for v in Order:
+            if self.Done[v] or not self.ok:
+                continue
+            Pos, Neg = list(Occ[v]), list(Occ[-v])
+            if not Pos or not Neg or len(Pos) * len(Neg) > self.ProductLimit:
+                continue
+            Resolvents = self.resolvents(v, Pos, Neg)
+            if Resolvents is None:
+                continue
+            for p in Pos:
+                self.Stack.append((v, tuple(Clauses[p])))
+            self.Stack.append((-v, (-v,)))
+            self.Done[v] = True
+            for i in Pos + Neg:
+                self.remove(i)
+            for R in Resolvents:
+                self.add(R)
+            self.propagate()
+            Changed = True
+        return Changed
+
+    def resolvents(self, v, Pos, Neg):
+        # Non-tautological resolvents on v, or None if eliminating v would not pay off
+        Clauses = self.Clauses
+        Limit = len(Pos) + len(Neg)
+        Negated = [(Clauses[n] - {-v}, {-l for l in Clauses[n]} - {v}) for n in Neg]
+        Resolvents = []
+        for p in Pos:
+            P = Clauses[p] - {v}
+            for N, NotN in Negated:
+                if not P.isdisjoint(NotN):
+                    continue  # tautology
+                if len(Resolvents) == Limit:
+                    return None
+                R = P | N
+                if len(R) > self.ResolventLimit:
+                    return None
+                Resolvents.append(R)
+        return Resolvents
+
+    def run(self, Rounds=10, Eliminate=True):
+        self.propagate()
+        for _ in range(Rounds):
+            if not self.ok:
+                break
+            Changed = self.pure_literals()
+            if Eliminate:
+                Changed |= self.subsume()
+                Changed |= self.eliminate()
+            Changed |= self.propagate()
+            if not Changed:
+                break
+        return self.ok
+
+    def reduced(self):
+        Reduced = ClauseDB()
+        for C in self.Clauses:
+            if C is not None:
+                Reduced.append(sorted(C, key=abs))
+        return Reduced
+
+
+def preprocess(Wff, Nvars, Rounds=10, Eliminate=True):
+    Nvars = max([Nvars] + [abs(l) for Clause in Wff for l in Clause])
+    simp = Simplifier(Nvars)
+    for Clause in Wff:
+        simp.add(Clause)
+    if not simp.ok or not simp.run(Rounds, Eliminate):
+        return False, ClauseDB(), simp.Stack
+    return True, simp.reduced(), simp.Stack
+
+
+def extend_model(Stack, Assignment):
+    # Turn a model of the reduced wff into one of the original (in place)
+    for Witness, Clause in reversed(Stack):
+        if not any((l > 0) == (Assignment[abs(l)] == 1) for l in Clause):
+            Assignment[abs(Witness)] = 1 if Witness > 0 else 0
+    return Assignment
@@ -1,7 +1,14 @@
-
 import time
+import heapq
 import random
 import string
+from contextlib import nullcontext
+
+from Dimacs_KeoughKitch import DimacsWriter
+from SolverStats_KeoughKitch import SolverStats
+from Preprocess_KeoughKitch import preprocess, extend_model
+from TwoSat_KeoughKitch import is_2cnf, check_2sat
+from Bitmask_KeoughKitch import verify_model
 
 # Following is an example of a wff with 3 variables, 3 literals/clause, and 4 clauses
 Num_Vars=3
@@ -13,68 +20,511 @@ wff=[[1,-2,-2],[2,3,3],[-1,-3,-3],[-1,-2,3],[1,2,-3]]
 Num_Clauses=8
 wff=[[-1,-2,-3],[-1,-2,3],[-1,2,-3],[-1,2,3],[1,-2,-3],[1,-2,3],[1,2,-3],[1,2,3]]
 
-def check(Wff, Nvars, Nclauses, Assignment):
-    # Create a count of the number of clauses and literal occurrences
-    literal_count = {}
-    unit_clauses = []
+# Conflict-driven clause learning (CDCL) engine behind check()
+#   Variables are numbered 1..nvars exactly as in a wff.  Internally a literal
+#   is stored as 2*var for "var is true" and 2*var+1 for "var is false", so the
+#   negation of a literal is lit ^ 1 and value/watch lists can be indexed by it.
+#   Every clause with 2+ literals watches the literals in positions 0 and 1;
+#   watches[lit] holds the clauses that must be revisited when lit turns false.
+#   On a conflict the first-UIP clause is learned, the solver backjumps, and the
+#   VSIDS activity of the variables involved is bumped.  Searches restart on a
+#   Luby schedule, and each variable remembers the phase it last had (phase saving).
+#
+# A Solver is also usable incrementally: add_clause() and solve() may be called
+#   any number of times, and learned clauses, activities and level-0 facts carry
+#   over between calls.  solve(Assumptions) decides the given literals first; if
+#   they cannot all hold, solve returns False and failed lists the assumptions
+#   responsible, without making the solver itself unsatisfiable.  push()/pop()
+#   scope clauses: each frame has a selector variable that is assumed true while
+#   the frame is open and fixed false once it is popped.  Selectors are internal
+#   variables, so to_int / to_ext map between wff variables and internal ones.
 
-    # First pass: Initialize the counts for literals and identify unit clauses
-    for clause in Wff:
-        if len(clause) == 1:
-            unit_clauses.append(clause[0])
-        for literal in clause:
-            abs_literal = abs(literal)
-            if abs_literal not in literal_count:
-                literal_count[abs_literal] = [0, 0]  # [positive_count, negative_count]
-            if literal > 0:
-                literal_count[abs_literal][0] += 1
-            else:
-                literal_count[abs_literal][1] += 1
-
-    # Apply Pure Literal Elimination
-    for literal, counts in literal_count.items():
-        if counts[0] > 0 and counts[1] == 0:  # Only positive literals
-            Assignment[literal] = 1
-        elif counts[1] > 0 and counts[0] == 0:  # Only negative literals
-            Assignment[literal] = 0
-
-    # Second pass: Assign values for unit clauses
-    for unit_literal in unit_clauses:
-        var = abs(unit_literal)
-        if unit_literal > 0:
-            Assignment[var] = 1  # Assign true
+def luby(x):
+    # x'th element (from 0) of the Luby sequence 1,1,2,1,1,2,4,1,1,2,...
+    size, seq = 1, 0
+    while size < x + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != x:
+        size = (size - 1) >> 1
+        seq -= 1
+        x = x % size
+    return 1 << seq
+
+
+class Solver:
+    RestartBase = 100      # conflicts in the first Luby restart interval
+    VarDecay = 0.95        # VSIDS decay applied after every conflict
+
+    def __init__(self, Nvars=0):
+        self.nvars = 0           # internal variables, including frame selectors
+        self.to_int = [0]        # wff variable -> internal variable
+        self.to_ext = [0]        # internal variable -> wff variable (0 for selectors)
+        self.frames = []         # selector variable of each open push() frame
+        self.clauses = []        # problem clauses (lists of internal literals)
+        self.learnts = []        # learned clauses
+        self.lbd = {}            # id(learnt clause) -> literal block distance
+        self.watches = [[], []]
+        self.value = [0, 0]      # per literal: 1 true, -1 false, 0 unassigned
+        self.level = [0]
+        self.reason = [None]
+        self.activity = [0.0]
+        self.phase = [1]         # saved phase: 0 positive, 1 negative
+        self.seen = [0]
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.order = []          # lazy max-heap of (-activity, var)
+        self.queued = [-1.0]     # activity of each var's live heap entry, -1 if none
+        self.var_inc = 1.0
+        self.max_learnts = 2000
+        self.simp_trail = -1     # level-0 trail size at the last _simplify()
+        self.ok = True
+        self.model = None
+        self.failed = []         # assumptions behind the last failed solve()
+        self.conflicts = 0       # lifetime counters, see SolverStats_KeoughKitch.py
+        self.decisions = 0
+        self.propagations = 0
+        self.restarts = 0
+        self.clause_visits = 0
+        self.lit_visits = 0
+        self.stats = None        # SolverStats of the solve() in progress, if any
+        self.stats_base = None
+        self.ensure_vars(Nvars)
+
+    def ensure_vars(self, Nvars):
+        # Make sure wff variables 1..Nvars exist
+        for v in range(len(self.to_int), Nvars + 1):
+            self.to_int.append(self._new_var())
+            self.to_ext[-1] = v
+
+    def _new_var(self):
+        self.nvars += 1
+        v = self.nvars
+        self.to_ext.append(0)
+        self.watches += [[], []]
+        self.value += [0, 0]
+        self.level.append(0)
+        self.reason.append(None)
+        self.activity.append(0.0)
+        self.phase.append(1)
+        self.seen.append(0)
+        self.queued.append(0.0)
+        heapq.heappush(self.order, (0.0, v))
+        return v
+
+    def _int_lit(self, l):
+        if abs(l) >= len(self.to_int):
+            self.ensure_vars(abs(l))
+        return 2 * self.to_int[l] if l > 0 else 2 * self.to_int[-l] + 1
+
+    def ext_lit(self, lit):
+        # Internal literal back to a wff literal (0 for frame selectors)
+        v = self.to_ext[lit >> 1]
+        return -v if lit & 1 else v
+
+    def add_clause(self, Clause):
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        lits = [self._int_lit(l) for l in Clause]
+        if self.frames:
+            lits.append(2 * self.frames[-1] + 1)  # active only while the frame is open
+        return self._add_lits(lits)
+
+    def _add_lits(self, Lits):
+        value = self.value
+        lits = set()
+        for lit in Lits:
+            if lit ^ 1 in lits or value[lit] == 1:
+                return True  # tautology or already satisfied
+            if value[lit] == 0:
+                lits.add(lit)
+        lits = list(lits)
+        if not lits:
+            self.ok = False
+        elif len(lits) == 1:
+            self._assign(lits[0], None)
+            self.ok = self._propagate() is None
         else:
-            Assignment[var] = 0  # Assign false
-
-    # Check if current assignment satisfies the WFF
-    Satisfiable = True
-    for clause in Wff:  # Check i'th clause
-        ClauseSatisfied = False
-        for literal in clause:  # Check each literal in the clause
-            VarValue = Assignment[abs(literal)]
-            if (literal > 0 and VarValue == 1) or (literal < 0 and VarValue == 0):
-                ClauseSatisfied = True
+            self.clauses.append(lits)
+            self.watches[lits[0]].append(lits)
+            self.watches[lits[1]].append(lits)
+        return self.ok
+
+    def _assign(self, lit, reason):
+        v = lit >> 1
+        self.value[lit] = 1
+        self.value[lit ^ 1] = -1
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def _propagate(self):
+        # Two-watched-literal unit propagation; returns a conflicting clause or None
+        trail, value, watches = self.trail, self.value, self.watches
+        level, reason = self.level, self.reason
+        dl = len(self.trail_lim)
+        qhead = self.qhead
+        assigned = len(trail)
+        visits = inspected = 0
+        while qhead < len(trail):
+            false_lit = trail[qhead] ^ 1
+            qhead += 1
+            ws = watches[false_lit]
+            i = j = 0
+            n = len(ws)
+            visits += n
+            while i < n:
+                c = ws[i]
+                i += 1
+                if c[0] == false_lit:
+                    c[0] = c[1]
+                    c[1] = false_lit
+                first = c[0]
+                if value[first] == 1:
+                    ws[j] = c
+                    j += 1
+                    continue
+                for k in range(2, len(c)):
+                    lit = c[k]
+                    if value[lit] != -1:
+                        c[1] = lit
+                        c[k] = false_lit
+                        watches[lit].append(c)
+                        inspected += k - 1
+                        break
+                else:
+                    inspected += len(c) - 2
+                    ws[j] = c
+                    j += 1
+                    if value[first] == -1:
+                        while i < n:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        self.qhead = len(trail)
+                        self.propagations += len(trail) - assigned
+                        self.clause_visits += visits
+                        self.lit_visits += inspected
+                        return c
+                    value[first] = 1
+                    value[first ^ 1] = -1
+                    level[first >> 1] = dl
+                    reason[first >> 1] = c
+                    trail.append(first)
+            del ws[j:]
+        self.qhead = qhead
+        self.propagations += len(trail) - assigned
+        self.clause_visits += visits
+        self.lit_visits += inspected
+        return None
+
+    def _analyze(self, confl):
+        # First-UIP conflict analysis; returns (learnt clause, backjump level)
+        seen, level, reason, trail = self.seen, self.level, self.reason, self.trail
+        activity = self.activity
+        dl = len(self.trail_lim)
+        learnt = [0]
+        path = 0
+        p = -1
+        idx = len(trail) - 1
+        while True:
+            for q in (confl if p < 0 else confl[1:]):
+                v = q >> 1
+                if not seen[v] and level[v] > 0:
+                    seen[v] = 1
+                    activity[v] += self.var_inc
+                    if activity[v] > 1e100:
+                        self._rescale()
+                    if level[v] >= dl:
+                        path += 1
+                    else:
+                        learnt.append(q)
+            while not seen[trail[idx] >> 1]:
+                idx -= 1
+            p = trail[idx]
+            idx -= 1
+            confl = reason[p >> 1]
+            seen[p >> 1] = 0
+            path -= 1
+            if path == 0:
                 break
-        if not ClauseSatisfied:  # If any clause is not satisfied
-            Satisfiable = False
-            break
-
-    if Satisfiable:  # Found a satisfying assignment
-        return True
-
-    # Generate the next assignment using binary increment
-    for i in range(1, Nvars + 1):
-        if Assignment[i] == 0:
-            Assignment[i] = 1  # Increment the current variable
-            break
-        else:
-            Assignment[i] = 0  # Reset to 0 and move to the next variable
-    else:
-        # If we exit the loop normally (no break), it means we've tried all assignments
+        learnt[0] = p ^ 1
+
+        # Drop literals implied by the rest of the clause (local minimization)
+        kept = [learnt[0]]
+        for q in learnt[1:]:
+            r = reason[q >> 1]
+            if r is None or any(not seen[l >> 1] and level[l >> 1] > 0 for l in r[1:]):
+                kept.append(q)
+        for q in learnt[1:]:
+            seen[q >> 1] = 0
+        learnt = kept
+
+        bt_level = 0
+        if len(learnt) > 1:
+            best = 1
+            for k in range(2, len(learnt)):
+                if level[learnt[k] >> 1] > level[learnt[best] >> 1]:
+                    best = k
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            bt_level = level[learnt[1] >> 1]
+        return learnt, bt_level
+
+    def _analyze_final(self, p):
+        # p is an assumption found false; collect the assumptions that forced it
+        failed = [p]
+        seen, level, reason, trail = self.seen, self.level, self.reason, self.trail
+        if not self.trail_lim or level[p >> 1] == 0:
+            return failed
+        seen[p >> 1] = 1
+        for i in range(len(trail) - 1, self.trail_lim[0] - 1, -1):
+            x = trail[i] >> 1
+            if seen[x]:
+                if reason[x] is None:
+                    failed.append(trail[i])  # an assumption decision
+                else:
+                    for l in reason[x][1:]:
+                        if level[l >> 1] > 0:
+                            seen[l >> 1] = 1
+                seen[x] = 0
+        return failed
+
+    def _rescale(self):
+        activity = self.activity
+        for v in range(1, self.nvars + 1):
+            activity[v] *= 1e-100
+        self.var_inc *= 1e-100
+        self._rebuild_order()
+
+    def _rebuild_order(self):
+        value, activity, queued = self.value, self.activity, self.queued
+        self.order = []
+        for v in range(1, self.nvars + 1):
+            if value[2 * v] == 0:
+                self.order.append((-activity[v], v))
+                queued[v] = activity[v]
+            else:
+                queued[v] = -1.0
+        heapq.heapify(self.order)
+
+    def _cancel_until(self, lvl):
+        if len(self.trail_lim) <= lvl:
+            return
+        trail, value, reason, phase = self.trail, self.value, self.reason, self.phase
+        order, activity, queued = self.order, self.activity, self.queued
+        lim = self.trail_lim[lvl]
+        for i in range(len(trail) - 1, lim - 1, -1):
+            lit = trail[i]
+            v = lit >> 1
+            value[lit] = 0
+            value[lit ^ 1] = 0
+            reason[v] = None
+            phase[v] = lit & 1
+            if queued[v] != activity[v]:
+                heapq.heappush(order, (-activity[v], v))
+                queued[v] = activity[v]
+        del trail[lim:]
+        del self.trail_lim[lvl:]
+        self.qhead = lim
+        if len(order) > 10 * self.nvars + 1000:
+            self._rebuild_order()
+
+    def _pick_branch(self):
+        order, value, queued = self.order, self.value, self.queued
+        while order:
+            act, v = heapq.heappop(order)
+            if queued[v] == -act:
+                queued[v] = -1.0
+            if value[2 * v] == 0:
+                return 2 * v + self.phase[v]
+        return -1
+
+    def _simplify(self):
+        # At level 0: drop satisfied clauses and false literals, then rewatch
+        if len(self.trail) == self.simp_trail:
+            if len(self.learnts) > self.max_learnts:
+                self._reduce_db()
+            return
+        self.simp_trail = len(self.trail)
+        value = self.value
+        for db in (self.clauses, self.learnts):
+            kept = []
+            for c in db:
+                if any(value[l] == 1 for l in c):
+                    self.lbd.pop(id(c), None)
+                    continue
+                c[:] = [l for l in c if value[l] == 0]
+                kept.append(c)
+            db[:] = kept
+        self._reduce_db()
+
+    def _reduce_db(self):
+        # Keep glue clauses (lbd <= 2) and the better half of the rest
+        if len(self.learnts) > self.max_learnts:
+            lbd = self.lbd
+            self.learnts.sort(key=lambda c: (lbd[id(c)], len(c)))
+            keep = max(self.max_learnts // 2, sum(1 for c in self.learnts if lbd[id(c)] <= 2))
+            for c in self.learnts[keep:]:
+                del lbd[id(c)]
+            del self.learnts[keep:]
+            self.max_learnts = int(self.max_learnts * 1.1)
+        watches = self.watches
+        for ws in watches:
+            ws.clear()
+        for db in (self.clauses, self.learnts):
+            for c in db:
+                watches[c[0]].append(c)
+                watches[c[1]].append(c)
+
+    def _search(self, Budget, Assumptions):
+        conflicts = 0
+        level, value = self.level, self.value
+        while True:
+            confl = self._propagate()
+            if confl is not None:
+                conflicts += 1
+                self.conflicts += 1
+                if self.stats is not None and self.stats.Callback is not None \
+                        and self.conflicts % self.stats.Every == 0:
+                    self._sync_stats()
+                    self.stats.Callback(self.stats)
+                if not self.trail_lim:
+                    return False
+                learnt, bt_level = self._analyze(confl)
+                self._cancel_until(bt_level)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    self.watches[learnt[0]].append(learnt)
+                    self.watches[learnt[1]].append(learnt)
+                    self.learnts.append(learnt)
+                    self.lbd[id(learnt)] = len({level[l >> 1] for l in learnt})
+                    self._assign(learnt[0], learnt)
+                self.var_inc /= self.VarDecay
+            else:
+                if conflicts >= Budget:
+                    self._cancel_until(0)
+                    return None
+                lit = -1
+                while len(self.trail_lim) < len(Assumptions):
+                    p = Assumptions[len(self.trail_lim)]
+                    if value[p] == 1:
+                        self.trail_lim.append(len(self.trail))  # already holds: empty level
+                    elif value[p] == -1:
+                        self.failed = self._analyze_final(p)
+                        return False
+                    else:
+                        lit = p
+                        break
+                if lit < 0:
+                    lit = self._pick_branch()
+                    if lit < 0:
+                        return True
+                self.decisions += 1
+                self.trail_lim.append(len(self.trail))
+                self._assign(lit, None)
+
+    def _counters(self):
+        return {'Assignments': self.decisions, 'Clauses': self.clause_visits,
+                'Literals': self.lit_visits, 'Propagations': self.propagations,
+                'Conflicts': self.conflicts, 'Restarts': self.restarts}
+
+    def _sync_stats(self):
+        for Field, Count in self._counters().items():
+            setattr(self.stats, Field, self.stats_base[Field] + Count)
+
+    def solve(self, Assumptions=(), MaxConflicts=None, Stats=None):
+        # True / False for SAT / UNSAT, or None if MaxConflicts ran out first.
+        #   Assumptions is a list of wff literals that must hold for this call only.
+        #   If Stats (a SolverStats) is given, the work done by this call is added to it.
+        if Stats is None:
+            return self._solve(Assumptions, MaxConflicts)
+        self.stats = Stats
+        self.stats_base = {Field: getattr(Stats, Field) - Count for Field, Count in self._counters().items()}
+        try:
+            return self._solve(Assumptions, MaxConflicts)
+        finally:
+            self._sync_stats()
+            self.stats = None
+
+    def _solve(self, Assumptions, MaxConflicts):
+        self.model = None
+        self.failed = []
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+        Assumptions = [2 * s for s in self.frames] + [self._int_lit(l) for l in Assumptions]
+        self.failed = None
+        restarts = 0
+        Limit = None if MaxConflicts is None else self.conflicts + MaxConflicts
+        while True:
+            Budget = luby(restarts) * self.RestartBase
+            if Limit is not None:
+                if self.conflicts >= Limit:
+                    self.failed = []
+                    return None
+                Budget = min(Budget, Limit - self.conflicts)
+            status = self._search(Budget, Assumptions)
+            if status is True:
+                value, to_int = self.value, self.to_int
+                self.model = [0] + [1 if value[2 * to_int[v]] == 1 else 0 for v in range(1, len(to_int))]
+                self.failed = []
+                self._cancel_until(0)
+                return True
+            if status is False:
+                if self.failed is None:  # conflict at level 0: UNSAT for good
+                    self.ok = False
+                    self.failed = []
+                else:
+                    self.failed = [self.ext_lit(l) for l in self.failed if self.to_ext[l >> 1]]
+                self._cancel_until(0)
+                return False
+            restarts += 1
+            self.restarts += 1
+            self._simplify()
+
+    def push(self):
+        # Open a frame; clauses added until the matching pop() belong to it
+        self._cancel_until(0)
+        self.frames.append(self._new_var())
+
+    def pop(self):
+        # Close the innermost frame, permanently disabling its clauses
+        self._cancel_until(0)
+        s = self.frames.pop()
+        if self.ok:
+            self._add_lits([2 * s + 1])
+
+
+def check(Wff, Nvars, Nclauses, Assignment, Stats=None, Simplify=False):
+    # Solve the wff (list of clauses or ClauseDB) with the CDCL engine;
+    #   on success Assignment[1..Nvars] holds a model.  With Simplify=True the wff
+    #   is first reduced by preprocess() and the model extended back afterwards.
+    #   A 2-CNF wff goes to the linear-time solver in TwoSat_KeoughKitch instead.
+    if is_2cnf(Wff):
+        return check_2sat(Wff, Nvars, Nclauses, Assignment, Stats)
+    Stack = []
+    if Simplify:
+        Satisfiable, Wff, Stack = preprocess(Wff, Nvars)
+        if not Satisfiable:
+            return False
+    solver = Solver(Nvars)
+    for clause in Wff:
+        if not solver.add_clause(clause):
+            return False
+    if not solver.solve(Stats=Stats):
         return False
+    for v in range(1, Nvars + 1):
+        Assignment[v] = solver.model[v]
+    extend_model(Stack, Assignment)
+    return True
 
-    return False  # No satisfying assignment was found
-    
 def build_wff(Nvars,Nclauses,LitsPerClause):
     wff=[]
     for i in range(1,Nclauses+1):
@@ -86,18 +536,33 @@ def build_wff(Nvars,Nclauses,LitsPerClause):
         wff.append(clause)
     return wff
 
-def test_wff(wff,Nvars,Nclauses):
+def test_wff(wff,Nvars,Nclauses,Check=check,Stats=None,Verify=True):
     Assignment=list((0 for x in range(Nvars+2)))
     start = time.time() # Start timer
-    SatFlag=check(wff,Nvars,Nclauses,Assignment)
+    if Stats is None:
+        SatFlag=Check(wff,Nvars,Nclauses,Assignment)
+    else:
+        SatFlag=Check(wff,Nvars,Nclauses,Assignment,Stats=Stats)
     end = time.time() # End timer
     exec_time=int((end-start)*1e6)
+    # Every model is checked against the wff (outside the timed part) unless Verify=False
+    if Verify and SatFlag and not verify_model(wff,Nvars,Assignment):
+        Name=getattr(Check,'__name__',repr(Check))
+        raise RuntimeError(f"{Name} returned an assignment that does not satisfy the wff")
     return [wff,Assignment,SatFlag,exec_time]
 
-def run_cases(TestCases, ProbNum, tablefile):
-    # Open table file to write results
-    with open(tablefile + ".csv", 'w') as tablef:
-        tablef.write("Clauses, SAT Time Taken (us), UNSAT Time Taken (us)\n")  # Table header
+def run_cases(TestCases, ProbNum, tablefile, Check=check, CnfFile=None, Counters=False, Wffs=None):
+    # Open table file to write results (and, if CnfFile is given, archive every wff there)
+    #   With Counters=True each row also gets the SolverStats counters of its trial
+    #   Wffs, if given, supplies the wffs in trial order (e.g. iter_wffs from
+    #   WffGen_KeoughKitch) instead of random.seed(ProbNum) + build_wff
+    Wffs = None if Wffs is None else iter(Wffs)
+    with open(tablefile + ".csv", 'w') as tablef, \
+            (DimacsWriter(CnfFile + ".cnf") if CnfFile else nullcontext()) as cnff:
+        Header = "Clauses, SAT Time Taken (us), UNSAT Time Taken (us)"
+        if Counters:
+            Header += ", " + SolverStats.csv_header()
+        tablef.write(Header + "\n")  # Table header
 
         for i in range(len(TestCases)):
             TestCase = TestCases[i]
@@ -107,17 +572,24 @@ def run_cases(TestCases, ProbNum, tablefile):
             Ntrials = TestCase[3]
 
             for j in range(Ntrials):
-                random.seed(ProbNum)
-                wff = build_wff(Nvars, NClauses, LitsPerClause)
-                results = test_wff(wff, Nvars, NClauses)
+                if Wffs is None:
+                    random.seed(ProbNum)
+                    wff = build_wff(Nvars, NClauses, LitsPerClause)
+                else:
+                    wff = next(Wffs)
+                Stats = SolverStats() if Counters else None
+                results = test_wff(wff, Nvars, NClauses, Check, Stats)
                 Exec_Time = results[3]
+                if cnff is not None:
+                    cnff.write_wff(wff, Nvars, ProbNum, LitsPerClause, results[2] if ShowAnswer else None)
+                Extra = "," + Stats.csv_row() if Counters else ""
 
                 if results[2]:  # Satisfiable
                     # Write SAT time
-                    tablef.write(f"{NClauses},{Exec_Time},\n")
+                    tablef.write(f"{NClauses},{Exec_Time},{Extra}\n")
                 else:  # Unsatisfiable
                     # Write UNSAT time
-                    tablef.write(f"{NClauses},,{Exec_Time}\n")
+                    tablef.write(f"{NClauses},,{Exec_Time}{Extra}\n")
 
                 # Increment problem number
                 ProbNum += 1
@@ -206,9 +678,17 @@ cnffile = r'cnffile'# Each of these list entries describes a series of random wf
 summaryfile = 'smartOutput_KeoughKitch'  # Name of the summary output file
 
 
-#run_cases(TC2,ProbNum,resultsfile,tracefile,cnffile)
-#run_cases(SAT2,ProbNum,resultsfile,tracefile,cnffile)
-run_cases(TestCases,ProbNum,summaryfile) # This takes a Looong Time!! 40  minutes
+if __name__ == "__main__":
+    #run_cases(TC2,ProbNum,resultsfile,tracefile,cnffile)
+    #run_cases(SAT2,ProbNum,resultsfile,tracefile,cnffile)
+    #run_cases(TestCases,ProbNum,summaryfile,CnfFile=cnffile) # Also archive every wff as DIMACS
+    #from WffCache_KeoughKitch import WffCache, cached_check
+    #with WffCache(Path="wffs.sqlite") as Cache: # Reruns answer from the cache
+    #    run_cases(TestCases,ProbNum,summaryfile,Check=cached_check(check,Cache))
+    #from WffGen_KeoughKitch import iter_wffs, ratio_cases
+    #Phase=ratio_cases(range(20,101,10),4.26,3,100) # 3-SAT across the phase transition
+    #run_cases(Phase,ProbNum,'smartPhase_KeoughKitch',Wffs=iter_wffs(Phase,ProbNum,Distinct=True))
+    run_cases(TestCases,ProbNum,summaryfile) # This takes a Looong Time!! 40  minutes
 
 
 
@@ -0,0 +1,314 @@
+#                    SAT solver daemon
+# A long-lived asyncio service that keeps a pool of warm worker processes (solver
+#   modules already imported) and answers wffs sent to it, so a batch of small jobs
+#   pays for interpreter startup once instead of once per run.
+#
+# Clients talk one JSON object per line, either on stdin/stdout or over a Unix
+#   socket that many clients can share (the queue and the workers are shared too):
+#     {"id": 7, "wff": [[1, -2], [2, 3]], "nvars": 3}      wff as a list of clauses
+#     {"id": 8, "dimacs": "p cnf 3 2\n1 -2 0\n2 3 0\n"}     or as DIMACS text
+#     {"cancel": 7}                                        cancel request 7
+#   Every request needs an "id" that none of the same client's unanswered requests
+#   is using; one without, or with a clashing id, is answered ERROR at once.
+#   Optional fields: "timeout" (seconds, counted from when the request arrives),
+#   "solver" and "check" (module and function name).  Only the solver module and
+#   check functions named by --solver / --check when the daemon starts are accepted;
+#   the default is the first --check of that module, SmartSat_KeoughKitch.check.
+#   Every request gets exactly one reply, in completion order, not arrival order:
+#     {"id": 7, "status": "SAT", "model": [1, -2, 3], "time_us": 85}
+#   status is SAT, UNSAT, TIMEOUT, CANCELLED or ERROR (with an "error" message).
+#   The model lists every variable 1..nvars as a true (v) or false (-v) literal,
+#   and is checked against the wff before it is sent; a model that fails is an ERROR.
+#
+# Requests wait in one queue and are started by one dispatcher per worker, so a job
+#   is only handed to the pool when a worker is free to run it at once.  Queued jobs
+#   are cancelled or expired without running.  A running job is stopped inside its
+#   worker: an interval timer (the same SIGALRM approach as ParallelRun_KeoughKitch)
+#   checks its deadline and its slot's cancel flag every Tick seconds.
+#
+# Workers are started with the 'spawn' method, all of them before the first client
+#   is served: a forked worker would inherit the client sockets open at that moment
+#   and keep those connections from ever closing.
+#
+# Example:
+#   python3 SolverDaemon_KeoughKitch.py                      # stdin / stdout
+#   python3 SolverDaemon_KeoughKitch.py < reqs.jsonl > replies.jsonl
+#   python3 SolverDaemon_KeoughKitch.py --socket /tmp/sat.sock --workers 4
+#   python3 SolverDaemon_KeoughKitch.py --solver DumbSat_KeoughKitch --check check --check check_bitmask
+
+import os
+import sys
+import json
+import stat
+import time
+import signal
+import asyncio
+import argparse
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from Dimacs_KeoughKitch import parse_dimacs
+from Bitmask_KeoughKitch import verify_model
+
+Tick = 0.05  # seconds between deadline / cancel checks in a running job
+
+_Flags = None     # shared cancel flag per dispatcher slot (worker side)
+_Slot = None      # slot of the job the worker is running
+_Deadline = None  # time.monotonic() at which that job expires
+
+
+class JobStopped(Exception):
+    pass
+
+
+def _check_stop(signum, frame):
+    if _Flags[_Slot]:
+        raise JobStopped("CANCELLED")
+    if _Deadline is not None and time.monotonic() >= _Deadline:
+        raise JobStopped("TIMEOUT")
+
+
+def _init_worker(Flags, Preload):
+    global _Flags
+    _Flags = Flags
+    signal.signal(signal.SIGALRM, _check_stop)
+    for Solver in Preload:
+        importlib.import_module(Solver)
+
+
+def solve_job(Slot, Solver, Check, Wff, Nvars, Timeout):
+    # Runs in a worker; returns (status, model, time in us)
+    global _Slot, _Deadline
+    _Slot = Slot
+    _Deadline = None if Timeout is None else time.monotonic() + Timeout
+    CheckFn = getattr(importlib.import_module(Solver), Check)
+    Assignment = [0] * (Nvars + 2)
+    start = time.perf_counter()
+    signal.setitimer(signal.ITIMER_REAL, Tick, Tick)
+    try:
+        SatFlag = CheckFn(Wff, Nvars, len(Wff), Assignment)
+        signal.setitimer(signal.ITIMER_REAL, 0)  # inside the try, so a late tick is still caught
+    except JobStopped as stop:
+        return str(stop), None, int((time.perf_counter() - start) * 1e6)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    Time = int((time.perf_counter() - start) * 1e6)
+    if not SatFlag:
+        return "UNSAT", None, Time
+    if not verify_model(Wff, Nvars, Assignment):
+        raise RuntimeError(f"{Check} returned an assignment that does not satisfy the wff")
+    return "SAT", [v if Assignment[v] else -v for v in range(1, Nvars + 1)], Time
+
+
+class Job:
+    def __init__(self, Id, Reply, Wff, Nvars, Solver, Check, Timeout):
+        self.Id = Id
+        self.Reply = Reply  # coroutine function taking the reply dict
+        self.Wff = Wff
+        self.Nvars = Nvars
+        self.Solver = Solver
+        self.Check = Check
+        self.Deadline = None if Timeout is None else time.monotonic() + Timeout
+        self.Slot = None
+        self.Done = False
+
+
+def parse_request(Request):
+    # Returns (wff as a list of lists, nvars) from the request's "wff" or "dimacs"
+    if 'dimacs' in Request:
+        Problems = parse_dimacs(Request['dimacs'])
+        if not Problems:
+            raise ValueError("no 'p cnf' header in dimacs")
+        Problem = Problems[0]
+        return Problem.Wff.to_lists(), Problem.Nvars
+    Wff = [[int(l) for l in Clause] for Clause in Request['wff']]
+    Nvars = max([int(Request.get('nvars', 0))] + [abs(l) for Clause in Wff for l in Clause])
+    return Wff, Nvars
+
+
+class SolverDaemon:
+    def __init__(self, Workers=None, Solver='SmartSat_KeoughKitch', Checks=('check',)):
+        self.Workers = Workers or os.cpu_count()
+        self.Solver = Solver
+        self.Checks = tuple(Checks)  # the only check functions requests may name
+        Module = importlib.import_module(Solver)
+        for Check in self.Checks:
+            if not callable(getattr(Module, Check, None)):
+                raise ValueError(f"{Solver} has no check function {Check!r}")
+        self.Queue = asyncio.Queue()
+        self.Jobs = {}  # (client, id) -> Job not yet answered
+        Context = multiprocessing.get_context('spawn')
+        self.Flags = Context.Array('b', self.Workers, lock=False)
+        self.Pool = ProcessPoolExecutor(self.Workers, mp_context=Context, initializer=_init_worker,
+                                        initargs=(self.Flags, (Solver,)))
+        self.Dispatchers = [asyncio.ensure_future(self.dispatch(Slot)) for Slot in range(self.Workers)]
+
+    async def start(self):
+        # Start every worker now, so the first requests do not wait for them
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.Pool, os.getpid) for _ in range(self.Workers)))
+
+    async def dispatch(self, Slot):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.Queue.get()
+            if job.Done:
+                continue  # cancelled while queued
+            Timeout = None
+            if job.Deadline is not None:
+                Timeout = job.Deadline - time.monotonic()
+                if Timeout <= 0:
+                    await self.finish(job, {"status": "TIMEOUT", "time_us": 0})
+                    continue
+            job.Slot = Slot
+            self.Flags[Slot] = 0
+            try:
+                Status, Model, Time = await loop.run_in_executor(
+                    self.Pool, solve_job, Slot, job.Solver, job.Check, job.Wff, job.Nvars, Timeout)
+                Reply = {"status": Status, "time_us": Time}
+                if Model is not None:
+                    Reply["model"] = Model
+            except Exception as e:
+                Reply = {"status": "ERROR", "error": f"{type(e).__name__}: {e}"}
+            job.Slot = None
+            await self.finish(job, Reply)
+
+    async def finish(self, job, Reply):
+        if job.Done:
+            return  # already answered as CANCELLED
+        job.Done = True
+        self.Jobs.pop((job.Reply, job.Id), None)
+        await job.Reply({"id": job.Id, **Reply})
+
+    async def handle(self, Line, Reply):
+        Request = {}
+        try:
+            Request = json.loads(Line)
+            if 'cancel' in Request:
+                job = self.Jobs.get((Reply, Request['cancel']))
+                if job is not None:
+                    if job.Slot is not None:
+                        self.Flags[job.Slot] = 1
+                    await self.finish(job, {"status": "CANCELLED"})
+                return
+            Id = Request.get('id')
+            if Id is None:
+                raise ValueError("request has no id")
+            if (Reply, Id) in self.Jobs:
+                raise ValueError(f"id {Id!r} is already in use by an unanswered request")
+            Wff, Nvars = parse_request(Request)
+            if Request.get('solver', self.Solver) != self.Solver:
+                raise ValueError(f"solver must be {self.Solver}")
+            Check = Request.get('check', self.Checks[0])
+            if Check not in self.Checks:
+                raise ValueError(f"check must be one of {', '.join(self.Checks)}")
+            job = Job(Id, Reply, Wff, Nvars, self.Solver, Check, Request.get('timeout'))
+        except Exception as e:
+            Id = Request.get('id') if isinstance(Request, dict) else None
+            await Reply({"id": Id, "status": "ERROR", "error": f"{type(e).__name__}: {e}"})
+            return
+        self.Jobs[(Reply, Id)] = job
+        self.Queue.put_nowait(job)
+
+    async def serve_stream(self, reader, writer):
+        # One client: read request lines until EOF, then wait for its outstanding replies
+        Lock = asyncio.Lock()
+
+        async def Reply(Message):
+            async with Lock:
+                writer.write((json.dumps(Message) + "\n").encode())
+                await writer.drain()
+
+        while Line := await reader.readline():
+            if Line.strip():
+                await self.handle(Line, Reply)
+        while any(Key[0] is Reply for Key in self.Jobs):
+            await asyncio.sleep(Tick)
+
+    async def close(self):
+        for Task in self.Dispatchers:
+            Task.cancel()
+        self.Pool.shutdown(cancel_futures=True)
+
+
+class _FileReader:
+    # StreamReader stand-in for a stdin that is a regular file, which the event loop
+    #   cannot watch: each readline runs in a thread
+    def __init__(self, File):
+        self.File = File
+
+    async def readline(self):
+        return await asyncio.get_running_loop().run_in_executor(None, self.File.readline)
+
+
+class _FileWriter:
+    # StreamWriter stand-in for a stdout that is a regular file; serve_stream only
+    #   writes under its reply lock, so plain blocking writes are safe
+    def __init__(self, File):
+        self.File = File
+
+    def write(self, Data):
+        self.File.write(Data)
+
+    async def drain(self):
+        self.File.flush()
+
+
+def _is_pipe(File):
+    # What the event loop's pipe transports accept
+    Mode = os.fstat(File.fileno()).st_mode
+    return stat.S_ISFIFO(Mode) or stat.S_ISSOCK(Mode) or stat.S_ISCHR(Mode)
+
+
+async def serve_stdio(daemon):
+    # Pipes, sockets and terminals go through the event loop; regular
+    #   files, as in "daemon < requests.jsonl > replies.jsonl", are read and written directly
+    loop = asyncio.get_running_loop()
+    if _is_pipe(sys.stdin):
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    else:
+        reader = _FileReader(sys.stdin.buffer)
+    if _is_pipe(sys.stdout):
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+        writer = asyncio.StreamWriter(transport, protocol, None, loop)
+    else:
+        writer = _FileWriter(sys.stdout.buffer)
+    await daemon.serve_stream(reader, writer)
+
+
+async def serve_socket(daemon, Path):
+    async def client(reader, writer):
+        try:
+            await daemon.serve_stream(reader, writer)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(client, path=Path)
+    async with server:
+        await server.serve_forever()
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve SAT check() requests from a warm worker pool")
+    parser.add_argument('--socket', help="listen on this Unix socket instead of stdin/stdout")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--solver', default='SmartSat_KeoughKitch')
+    parser.add_argument('--check', action='append',
+                        help="check function of the solver that requests may use (repeatable; default check)")
+    args = parser.parse_args(argv)
+
+    daemon = SolverDaemon(args.workers, args.solver, args.check or ['check'])
+    try:
+        await daemon.start()
+        if args.socket:
+            await serve_socket(daemon, args.socket)
+        else:
+            await serve_stdio(daemon)
+    finally:
+        await daemon.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+#                    Solver counters
+# A SolverStats object can be passed as Stats=... to the check functions in
+#   DumbSat_KeoughKitch.py and SmartSat_KeoughKitch.py (and to Solver.solve).
+#   The solver adds what it did during the call to these counters:
+#     Assignments   full assignments tried (DumbSat) / branching decisions (SmartSat)
+#     Clauses       clauses visited: evaluated (DumbSat) / watch list entries scanned (SmartSat)
+#     Literals      literals inspected
+#     Propagations  literals assigned by unit propagation
+#     Conflicts     conflicts analyzed
+#     Restarts      search restarts
+#   Counters accumulate, so one object can be reused across many calls.
+#   In CSV output the Clauses and Literals counters are headed "Clause Visits" and
+#   "Literal Visits", so they are not confused with the table's clause count.
+#
+# If Callback is set, it is called with the stats object about every Every
+#   assignments (DumbSat) or conflicts (SmartSat) while a search is running, so
+#   long runs can report progress.  When no Stats object is passed, the solvers do
+#   not count beyond what they already track internally.
+
+class SolverStats:
+    __slots__ = ('Assignments', 'Clauses', 'Literals', 'Propagations', 'Conflicts',
+                 'Restarts', 'Callback', 'Every')
+
+    Fields = ('Assignments', 'Clauses', 'Literals', 'Propagations', 'Conflicts', 'Restarts')
+    # CSV column names; run_cases tables already have a "Clauses" column (the clause count)
+    Headers = ('Assignments', 'Clause Visits', 'Literal Visits', 'Propagations', 'Conflicts', 'Restarts')
+
+    def __init__(self, Callback=None, Every=10000):
+        for Field in self.Fields:
+            setattr(self, Field, 0)
+        self.Callback = Callback
+        self.Every = Every
+
+    def as_dict(self):
+        return {Field: getattr(self, Field) for Field in self.Fields}
+
+    @classmethod
+    def csv_header(cls):
+        return ', '.join(cls.Headers)
+
+    def csv_row(self):
+        return ','.join(str(getattr(self, Field)) for Field in self.Fields)
+
+    def __repr__(self):
+        return 'SolverStats(' + ', '.join(f"{k}={v}" for k, v in self.as_dict().items()) + ')'
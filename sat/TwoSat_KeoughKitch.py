@@ -0,0 +1,108 @@
+#                    Linear-time 2-SAT
+# A 2-CNF wff (no clause longer than two literals) is solved in O(vars + clauses)
+#   through its implication graph: clause [a, b] gives the edges -a -> b and
+#   -b -> a, and a unit clause [a] the edge -a -> a.  The wff is UNSAT exactly when
+#   some variable is in the same strongly connected component as its negation.
+#   Otherwise making a literal true whenever its component comes after its
+#   negation's in topological order gives a model.
+#
+# Components are found with Tarjan's algorithm using explicit stacks instead of
+#   recursion, so wffs with millions of clauses do not hit Python's recursion limit.
+#   The graph is held in CSR form: literal l is node 2*abs(l) + (l < 0), and the
+#   successors of node n are Targets[Starts[n]:Starts[n+1]].
+
+def is_2cnf(Wff):
+    return all(len(Clause) <= 2 for Clause in Wff)
+
+
+def implication_graph(Wff, Nvars):
+    # Returns (Starts, Targets), or None if the wff has an empty clause
+    Src = []
+    Dst = []
+    for Clause in Wff:
+        if len(Clause) == 2:
+            a, b = Clause
+        elif len(Clause) == 1:
+            a = b = Clause[0]
+        else:
+            return None
+        # -a -> b and -b -> a
+        Src.append(2 * abs(a) + (a > 0))
+        Dst.append(2 * abs(b) + (b < 0))
+        Src.append(2 * abs(b) + (b > 0))
+        Dst.append(2 * abs(a) + (a < 0))
+    Nnodes = 2 * Nvars + 2
+    Starts = [0] * (Nnodes + 1)
+    for s in Src:
+        Starts[s + 1] += 1
+    for n in range(Nnodes):
+        Starts[n + 1] += Starts[n]
+    Fill = Starts[:]
+    Targets = [0] * len(Dst)
+    for s, d in zip(Src, Dst):
+        Targets[Fill[s]] = d
+        Fill[s] += 1
+    return Starts, Targets
+
+
+def components(Starts, Targets):
+    # Tarjan's SCC.  Comp[n] numbers the components in reverse topological order:
+    #   a component only has edges into components with smaller numbers.
+    Nnodes = len(Starts) - 1
+    Index = [-1] * Nnodes
+    Low = [0] * Nnodes
+    Comp = [-1] * Nnodes
+    Next = Starts[:]   # next edge to follow out of each node
+    Stack = []         # nodes of components not yet completed
+    Counter = 0
+    NComp = 0
+    for Root in range(Nnodes):
+        if Index[Root] >= 0:
+            continue
+        Index[Root] = Low[Root] = Counter
+        Counter += 1
+        Stack.append(Root)
+        Path = [Root]  # replaces the recursion stack
+        while Path:
+            v = Path[-1]
+            e = Next[v]
+            if e < Starts[v + 1]:
+                Next[v] = e + 1
+                w = Targets[e]
+                if Index[w] < 0:
+                    Index[w] = Low[w] = Counter
+                    Counter += 1
+                    Stack.append(w)
+                    Path.append(w)
+                elif Comp[w] < 0 and Index[w] < Low[v]:
+                    Low[v] = Index[w]
+                continue
+            Path.pop()
+            if Path and Low[v] < Low[Path[-1]]:
+                Low[Path[-1]] = Low[v]
+            if Low[v] == Index[v]:
+                while True:
+                    w = Stack.pop()
+                    Comp[w] = NComp
+                    if w == v:
+                        break
+                NComp += 1
+    return Comp
+
+
+def check_2sat(Wff, Nvars, Nclauses, Assignment, Stats=None):
+    # Same interface as check(); only valid when is_2cnf(Wff)
+    Nmax = max([Nvars] + [abs(l) for Clause in Wff for l in Clause])
+    Graph = implication_graph(Wff, Nmax)
+    if Stats is not None:
+        Stats.Clauses += len(Wff)
+        Stats.Literals += sum(len(Clause) for Clause in Wff)
+    if Graph is None:
+        return False
+    Comp = components(*Graph)
+    for v in range(1, Nmax + 1):
+        if Comp[2 * v] == Comp[2 * v + 1]:
+            return False
+    for v in range(1, Nvars + 1):
+        Assignment[v] = 1 if Comp[2 * v] < Comp[2 * v + 1] else 0
+    return True
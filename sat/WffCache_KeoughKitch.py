@@ -0,0 +1,163 @@
+#                    Wff result cache
+# A WffCache remembers the verdict (and model) for every wff it has seen, keyed on a
+#   hash of the wff's canonical form, so rerunning a sweep or meeting the same wff
+#   twice costs a lookup instead of a solve.  cached_check() wraps any check()
+#   function with a cache and can be handed to test_wff / run_cases as Check=...
+#
+# The canonical form:
+#   - sorts and deduplicates the literals of every clause and drops tautologies
+#   - sorts and deduplicates the clauses
+#   - renames the variables 1, 2, 3, ... in order of first appearance in that
+#     sorted list, then sorts again under the new names
+#   Wffs that differ only in clause order, literal order, repeated literals or
+#   clauses, or in which variable numbers they skip, get the same key.  Wffs that
+#   are the same up to an arbitrary renaming of variables usually do not.
+#
+# Entries live in an in-memory LRU of at most MaxSize wffs.  If Path is given they
+#   are also written to an sqlite database there, which is consulted on an LRU
+#   miss, so results survive between runs.  Writes are committed every CommitEvery
+#   entries and on close().  Canonicalizing costs about as much as a small solve,
+#   so the LRU also maps each wff exactly as it was given (a tuple of clause
+#   tuples) to its key, and a repeated wff is answered without canonicalizing.
+#
+# Example:
+#   with WffCache(Path="wffs.sqlite") as Cache:
+#       run_cases(TestCases, ProbNum, tablefile, Check=cached_check(check, Cache))
+
+import sqlite3
+import hashlib
+from array import array
+from collections import OrderedDict
+
+
+def canonical(Wff):
+    # Returns (canonical clause list, Vars) where Vars[i] is the original variable
+    #   renamed to i + 1
+    Clauses = set()
+    for Clause in Wff:
+        Lits = set(Clause)
+        if not any(-l in Lits for l in Lits):
+            Clauses.add(tuple(sorted(Lits, key=lambda l: (abs(l), l))))
+    Rename = {}
+    for Clause in sorted(Clauses):
+        for l in Clause:
+            if abs(l) not in Rename:
+                Rename[abs(l)] = len(Rename) + 1
+    Canon = sorted(tuple(sorted((Rename[abs(l)] if l > 0 else -Rename[abs(l)] for l in Clause),
+                                key=lambda l: (abs(l), l)))
+                   for Clause in Clauses)
+    return Canon, sorted(Rename, key=Rename.get)
+
+
+def wff_key(Canon):
+    Flat = array('i')
+    for Clause in Canon:
+        Flat.extend(Clause)
+        Flat.append(0)
+    return hashlib.blake2b(Flat.tobytes(), digest_size=16).hexdigest()
+
+
+class WffCache:
+    def __init__(self, MaxSize=100000, Path=None, CommitEvery=100):
+        self.MaxSize = MaxSize
+        self.Entries = OrderedDict()  # key -> (SatFlag, model bytes over canonical vars)
+        self.Seen = OrderedDict()     # wff as given -> (key, Vars)
+        self.Hits = 0
+        self.Misses = 0
+        self.CommitEvery = CommitEvery
+        self.Pending = 0
+        self.db = None
+        if Path is not None:
+            self.db = sqlite3.connect(Path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS wffs "
+                            "(key TEXT PRIMARY KEY, sat INTEGER, model BLOB)")
+
+    def get(self, Key):
+        # Returns (SatFlag, Model) or None
+        Entry = self.Entries.get(Key)
+        if Entry is not None:
+            self.Entries.move_to_end(Key)
+        elif self.db is not None:
+            Row = self.db.execute("SELECT sat, model FROM wffs WHERE key = ?", (Key,)).fetchone()
+            if Row is not None:
+                Entry = (bool(Row[0]), Row[1])
+                self._remember(Key, Entry)
+        if Entry is None:
+            self.Misses += 1
+        else:
+            self.Hits += 1
+        return Entry
+
+    def put(self, Key, SatFlag, Model):
+        Entry = (bool(SatFlag), bytes(Model))
+        self._remember(Key, Entry)
+        if self.db is not None:
+            self.db.execute("INSERT OR REPLACE INTO wffs VALUES (?, ?, ?)",
+                            (Key, int(Entry[0]), Entry[1]))
+            self.Pending += 1
+            if self.Pending >= self.CommitEvery:
+                self.db.commit()
+                self.Pending = 0
+
+    def lookup(self, Wff):
+        # Returns (key, Vars, canonical wff); the canonical wff is None when Wff was
+        #   found in Seen and did not have to be canonicalized
+        Raw = tuple(map(tuple, Wff))
+        Known = self.Seen.get(Raw)
+        if Known is not None:
+            self.Seen.move_to_end(Raw)
+            return Known[0], Known[1], None
+        Canon, Vars = canonical(Raw)
+        Key = wff_key(Canon)
+        self.Seen[Raw] = (Key, Vars)
+        if len(self.Seen) > self.MaxSize:
+            self.Seen.popitem(last=False)
+        return Key, Vars, Canon
+
+    def _remember(self, Key, Entry):
+        self.Entries[Key] = Entry
+        self.Entries.move_to_end(Key)
+        if len(self.Entries) > self.MaxSize:
+            self.Entries.popitem(last=False)
+
+    def close(self):
+        if self.db is not None:
+            self.db.commit()
+            self.db.close()
+            self.db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.Entries)
+
+
+def cached_check(Check, Cache):
+    # A check() that consults Cache first and only calls Check on a miss
+    def check(Wff, Nvars, Nclauses, Assignment, Stats=None):
+        Key, Vars, Canon = Cache.lookup(Wff)
+        Entry = Cache.get(Key)
+        if Entry is None:
+            if Canon is None:
+                Canon = canonical(Wff)[0]
+            # Solve the canonical wff so the model is stored over canonical vars
+            Local = [0] * (len(Vars) + 2)
+            if not Canon:
+                SatFlag = True  # nothing left but tautologies
+            elif Stats is None:
+                SatFlag = Check(Canon, len(Vars), len(Canon), Local)
+            else:
+                SatFlag = Check(Canon, len(Vars), len(Canon), Local, Stats=Stats)
+            Entry = (bool(SatFlag), bytes(Local[1:len(Vars) + 1]) if SatFlag else b'')
+            Cache.put(Key, *Entry)
+        SatFlag, Model = Entry
+        if SatFlag:
+            for i, v in enumerate(Vars):
+                if v <= Nvars:
+                    Assignment[v] = Model[i]
+        return SatFlag
+    return check
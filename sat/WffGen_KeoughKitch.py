@@ -0,0 +1,67 @@
+#                    Batched random wff generation
+# build_wff draws two Python random numbers per literal and builds nested lists, so
+#   on large sweeps generating the wffs starts to cost as much as solving them.
+#   wff_batch draws the literals of many wffs of one shape in a single NumPy call,
+#   and iter_wffs walks a whole TestCases sweep lazily, one batch at a time, handing
+#   each wff out as a ClauseDB over a slice of the batch (no copy).  Memory stays
+#   bounded by one batch of at most MaxLits literals however long the sweep is.
+#
+# Reproducibility: the batch that starts at problem number p is drawn from
+#   numpy.random.default_rng(p), so the same TestCases, ProbNum and Batch always give
+#   the same wffs.  This is a different random stream from random.seed(ProbNum) +
+#   build_wff: the wffs are the same kind (uniform variables and signs) but not the
+#   same wffs, and changing Batch changes which wffs come out.
+#
+# Distinct=True redraws any clause that repeats a variable, so every clause has
+#   LitsPerClause different variables (the usual random k-SAT model).
+#   ratio_cases builds TestCases rows with a fixed clause/variable ratio, for
+#   sweeps across the phase transition (about 4.26 for 3-SAT).
+#
+# Example:
+#   Cases = ratio_cases(range(20, 101, 10), 4.26, 3, 100)
+#   run_cases(Cases, ProbNum, 'phase', Wffs=iter_wffs(Cases, ProbNum, Distinct=True))
+
+import numpy as np
+
+from ClauseDB_KeoughKitch import ClauseDB
+
+
+def wff_batch(Nvars, Nclauses, LitsPerClause, Count, rng, Distinct=False):
+    # Returns an int32 array of shape (Count, Nclauses, LitsPerClause) of literals
+    if Distinct and LitsPerClause > Nvars:
+        raise ValueError(f"cannot pick {LitsPerClause} distinct variables out of {Nvars}")
+    Shape = (Count * Nclauses, LitsPerClause)
+    if Distinct and Nvars <= 4 * LitsPerClause:
+        # Few variables: take the first LitsPerClause of a random permutation per clause
+        Vars = np.argsort(rng.random((Shape[0], Nvars)), axis=1)[:, :LitsPerClause].astype(np.int32) + 1
+    else:
+        Vars = rng.integers(1, Nvars + 1, size=Shape, dtype=np.int32)
+        while Distinct:
+            Sorted = np.sort(Vars, axis=1)
+            Repeats = np.flatnonzero((Sorted[:, 1:] == Sorted[:, :-1]).any(axis=1))
+            if not len(Repeats):
+                break
+            Vars[Repeats] = rng.integers(1, Nvars + 1, size=(len(Repeats), LitsPerClause), dtype=np.int32)
+    Signs = rng.integers(0, 2, size=Shape, dtype=np.int32) * 2 - 1
+    return (Vars * Signs).reshape(Count, Nclauses, LitsPerClause)
+
+
+def iter_wffs(TestCases, ProbNum, Batch=1000, Distinct=False, MaxLits=1 << 22):
+    # Yields one ClauseDB per trial, in the order run_cases visits them
+    for Nvars, NClauses, LitsPerClause, Ntrials in TestCases:
+        PerBatch = max(1, min(Batch, MaxLits // max(1, NClauses * LitsPerClause)))
+        Starts = np.arange(0, NClauses * LitsPerClause + 1, LitsPerClause, dtype=np.int64)
+        Done = 0
+        while Done < Ntrials:
+            Count = min(PerBatch, Ntrials - Done)
+            Lits = wff_batch(Nvars, NClauses, LitsPerClause, Count,
+                             np.random.default_rng(ProbNum), Distinct)
+            for k in range(Count):
+                yield ClauseDB(Lits[k].reshape(-1), Starts)
+            Done += Count
+            ProbNum += Count
+
+
+def ratio_cases(VarCounts, Ratio, LitsPerClause, Ntrials):
+    # TestCases rows with round(Ratio * Nvars) clauses for each Nvars
+    return [[Nvars, max(1, round(Ratio * Nvars)), LitsPerClause, Ntrials] for Nvars in VarCounts]